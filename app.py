@@ -1,7 +1,7 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-from sodapy import Socrata
+import numpy as np
 from datetime import datetime, date
 import plotly.express as px
 import plotly.graph_objects as go
@@ -14,10 +14,62 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from io import BytesIO
 import os
-import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import data_store
+import data_sync
+import local_engine
+from processing import (process_contributions, process_expenditures, add_recipient_final, compact_transactions,
+                        frame_memory, find_column, sort_by_date, CONTRIBUTION_DATE_COLUMNS, EXPENDITURE_DATE_COLUMNS,
+                        CONTRIBUTION_AMOUNT_COLUMNS, EXPENDITURE_AMOUNT_COLUMNS, TRANSACTION_TYPE_COLUMNS)
+from cash_index import CashBalanceIndex, RunningTotal
+from facet_index import FacetIndex
+from socrata_client import SocrataClient
+from single_flight import SingleFlight
+import warm_cache
+
+logger = logging.getLogger(__name__)
+# Streamlit doesn't configure the root logger, so info messages (the committee
+# cache memory report) would be dropped without a handler of their own. Reruns
+# reuse the logger, so it is only set up once.
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 # Constants
 DEFAULT_START_DATE = date(2024, 1, 1)
+FETCH_WORKERS = 8  # Max concurrent Socrata fetches across all sessions
+
+# Where committee and transaction data is read from: "socrata" (the live API)
+# or "local" (the SQLite database built by local_engine.py)
+DATA_BACKEND = os.getenv("DATA_BACKEND", "socrata")
+DATASET_VERSION_POLL_TTL = 60  # Seconds between rowsUpdatedAt checks
+# Data caches are keyed on dataset versions; this TTL is only a safety net for
+# when the versions can't be fetched
+CACHE_BACKSTOP_TTL = 24 * 3600
+COMMITTEE_CACHE_MAX_ENTRIES = 64  # Committees kept in memory (old versions age out)
+# Committees with more transactions than this open in summary mode, where the
+# Analysis tab is computed by Socrata instead of downloading every row
+AGGREGATION_MODE_MIN_ROWS = 100000
+# Columns summary mode aggregates on; it is only offered when the datasets have them
+AGGREGATION_COLUMNS = {
+    "smfg-ds7h": ['date', 'amount', 'state', 'transaction_type', 'organization_nm', 'first_nm', 'last_nm'],
+    "3adi-mht4": ['date', 'amount', 'state', 'organization_nm', 'first_nm', 'last_nm']
+}
+
+# Donor and recipient rows summary mode fetches, largest first. Names are regrouped
+# locally (an organization's rows merge across person names), so this is more
+# than the five the charts show
+SUMMARY_TOP_ROWS = 100
+
+# Periods the Cash on Hand table can be grouped by, as pandas period codes
+COH_PERIODS = {"Year": "Y", "Quarter": "Q", "Month": "M"}
+
+RESULTS_PAGE_SIZE = 50  # Committees listed per page of search results
 
 # Committee Categories Mapping
 COMMITTEE_CATEGORIES = {
@@ -296,255 +348,518 @@ except Exception as e:
     if socrata_token is None:
         st.warning("⚠️ Socrata token not found. Please set SOCRATA_TOKEN in secrets or environment variables.")
 
-# Initialize Socrata client with increased timeout and retry support
-# Increased timeout to handle large datasets on Streamlit Cloud
-client = Socrata("data.iowa.gov", app_token=socrata_token, timeout=120)
+@st.cache_resource
+def get_socrata_client(app_token):
+    """Socrata client shared by all sessions, so they share its connection pool,
+    retry policy and timeouts (see socrata_client.py)."""
+    return SocrataClient(app_token=app_token)
+
+# Initialize Socrata client - one pooled client for all Socrata traffic
+client = get_socrata_client(socrata_token)
 
 # Initialize session state
 if 'selected_committee' not in st.session_state:
     st.session_state.selected_committee = None
 if 'filter_reset_counter' not in st.session_state:
     st.session_state.filter_reset_counter = 0
+if 'results_page' not in st.session_state:
+    st.session_state.results_page = 0
 
-# Function to get dataset metadata (last updated time)
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_dataset_metadata():
-    """Get metadata for the main datasets to find last update time."""
-    try:
-        # Try to get metadata from the committee dataset
-        metadata_url = "https://data.iowa.gov/api/views/5dtu-swbk.json"
-        response = requests.get(metadata_url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            # Try to find updatedAt or similar field
-            if 'rowsUpdatedAt' in data:
-                return data['rowsUpdatedAt']
-            elif 'updatedAt' in data:
-                return data['updatedAt']
-            elif 'viewLastModified' in data:
-                return data['viewLastModified']
-    except Exception as e:
-        # If metadata fetch fails, return None
-        pass
-    return None
-
-# Step 1: Load full committee dataset (cached indefinitely)
-@st.cache_data
-def load_committee_dataset():
-    """Fetch all committee data for filtering with retry logic."""
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            results = client.get("5dtu-swbk", select="*", limit=500000)
-            df = pd.DataFrame.from_records(results)
-            if not df.empty:
-                return df
-            else:
-                # Empty result, but no error - might be valid
-                return df
-        except (ConnectionError, requests.exceptions.ConnectionError, OSError) as e:
-            # Connection errors - retry with exponential backoff
-            if attempt < max_retries - 1:
-                wait_time = retry_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
-                time.sleep(wait_time)
-                continue
-            else:
-                st.error(f"Could not fetch committees after {max_retries} attempts: {str(e)}")
-                return pd.DataFrame()
-        except Exception as e:
-            # Other errors - don't retry, just return empty
-            st.error(f"Error loading committee dataset: {str(e)}")
-            return pd.DataFrame()
-    
-    return pd.DataFrame()
+@st.cache_resource
+def get_backend():
+    """Data backend shared by all sessions: Socrata, or the local SQLite engine
+    when DATA_BACKEND is "local". Both answer the same queries."""
+    if DATA_BACKEND == "local":
+        return local_engine.LocalBackend()
+    return data_sync.SocrataBackend(client)
 
-# Server-side filtering: Get committees with data since a given date
-@st.cache_data(ttl=3600)
-def get_committees_with_data_since(min_date):
-    """Get list of committees that have published data since the given date with retry logic."""
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    # Format date for Socrata query
-    date_str = min_date.strftime('%Y-%m-%dT00:00:00')
+# Function to get dataset versions (last updated time of each dataset)
+@st.cache_data(ttl=DATASET_VERSION_POLL_TTL)
+def get_dataset_versions():
+    """Get the rowsUpdatedAt version of each dataset (for the local engine, the
+    versions its database was built from). Data caches include these versions in
+    their keys, so they are reused until the data changes. Unknown versions are None."""
+    return get_backend().dataset_versions()
+
+# Step 1: Load full committee dataset (cached per dataset version)
+@st.cache_data(ttl=CACHE_BACKSTOP_TTL)
+def load_committee_dataset(version=None):
+    """Fetch all committee data for filtering.
+    Served from the on-disk cache when it was synced at the current version so cold
+    starts skip the download. Errors are raised for the caller to report; the cache
+    warmer calls this from a thread where Streamlit output can't be shown."""
+    return get_backend().committee_list(version)
+
+# Committee list columns behind each search filter, in order of preference
+SEARCH_FACETS = {
+    'committee_type': ['committee_type', 'type', 'type_nm', 'committee_type_nm'],
+    'election_year': ['election_year', 'election_yr', 'year', 'election_year_text'],
+    'party': ['party', 'party_nm', 'party_name', 'political_party'],
+    'office': ['office', 'office_sought', 'office_nm', 'office_name'],
+    'district': ['district', 'district_nbr', 'district_number', 'district_num'],
+    'candidate_name': ['candidate_name', 'candidate_nm', 'candidate', 'name'],
+    'committee_name': ['committee_name', 'committee_nm', 'committee']
+}
+
+@st.cache_resource(ttl=CACHE_BACKSTOP_TTL, max_entries=2)
+def get_committee_search(version=None):
+    """The committee list and its FacetIndex, built together once per dataset version
+    and shared read-only by all sessions. Loading both in one call keeps the index's
+    row masks aligned with the frame they select from. Raises when the list couldn't
+    be loaded, so an empty list isn't kept."""
+    df_committees = load_committee_dataset(version)
+    if df_committees.empty:
+        raise ValueError("The committee list is empty")
+    columns = {name: find_column(df_committees, candidates) for name, candidates in SEARCH_FACETS.items()}
+    search_index = FacetIndex(df_committees, {name: col for name, col in columns.items() if col},
+                              reverse={'election_year'}, searchable={'candidate_name', 'committee_name'})
+    return df_committees, search_index
+
+@st.cache_resource
+def get_fetch_executor():
+    """Thread pool shared by all sessions for concurrent dataset fetches."""
+    return ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="socrata-fetch")
+
+@st.cache_resource
+def get_single_flight():
+    """Coalesces concurrent identical fetches from different sessions into one."""
+    return SingleFlight()
+
+# Step 2: Load committee-specific data
+def fetch_committee_data(committee_name, contributions_version=None, expenditures_version=None,
+                         show_progress=True):
+    """Fetch all contributions and expenditures for a specific committee.
+    Both datasets are fetched in parallel and the client retries individual pages,
+    so a retry never re-downloads the other dataset or earlier pages. Each side is
+    served from the on-disk cache when it was synced at the current dataset version;
+    a stale copy is refreshed incrementally (see data_sync). Concurrent sessions
+    loading the same committee share one download per dataset, and only that
+    download takes a pool worker. show_progress=False
+    skips the progress line, for callers outside a script run (the cache warmer)."""
+    # Rows loaded so far per dataset, updated from the worker threads
+    rows_loaded = {'contributions': 0, 'expenditures': 0}
+    
+    def submit_side(dataset_id, label, version):
+        def on_progress(n):
+            rows_loaded[label] = n
+        # Sessions arriving while this side is already syncing wait for that sync
+        return get_single_flight().submit(
+            ('committee_data', dataset_id, committee_name, version),
+            get_fetch_executor(),
+            lambda: get_backend().committee_transactions(dataset_id, committee_name, version,
+                                                         on_progress=on_progress)
+        )
     
-    for attempt in range(max_retries):
-        try:
-            # Query for distinct committee names with date >= min_date
-            results = client.get(
-                "smfg-ds7h",
-                select="DISTINCT committee_nm",
-                where=f"date >= '{date_str}'",
-                limit=500000
+    contributions_future = submit_side("smfg-ds7h", 'contributions', contributions_version)
+    expenditures_future = submit_side("3adi-mht4", 'expenditures', expenditures_version)
+    
+    # Progress line shown under the loading spinner while pages stream in.
+    # Streamlit calls must stay on the script thread, so poll the workers here.
+    progress_text = st.empty() if show_progress else None
+    pending = {contributions_future, expenditures_future}
+    while pending:
+        _, pending = wait(pending, timeout=0.5)
+        if progress_text is not None:
+            progress_text.caption(
+                f"Loaded {rows_loaded['contributions']:,} contributions and "
+                f"{rows_loaded['expenditures']:,} expenditures..."
             )
-            # Extract committee names from results
-            committee_names = set()
-            for record in results:
-                if 'committee_nm' in record and record['committee_nm']:
-                    committee_names.add(record['committee_nm'])
-            return list(committee_names)
-        except (ConnectionError, requests.exceptions.ConnectionError, OSError) as e:
-            # Connection errors - retry with exponential backoff
-            if attempt < max_retries - 1:
-                wait_time = retry_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
-                time.sleep(wait_time)
-                continue
-            else:
-                st.warning(f"Could not fetch committees after {max_retries} attempts: {str(e)}")
-                return []
-        except Exception as e:
-            # Other errors - don't retry, just return empty
-            st.warning(f"Could not fetch committees: {str(e)}")
-            return []
+    if progress_text is not None:
+        progress_text.empty()
     
-    return []
+    # Errors propagate so the caches above don't keep a failed fetch
+    return contributions_future.result(), expenditures_future.result()
 
-# Helper function to get latest data date for a committee
-@st.cache_data(ttl=3600)
-def get_committee_latest_date(committee_name):
-    """Get the latest data date for a committee (cached)."""
-    try:
-        escaped_name = committee_name.replace("'", "''")
-        # Get latest contribution date
-        contrib_query = f"committee_nm='{escaped_name}'"
-        contrib_dates = client.get("smfg-ds7h", 
-                                   where=contrib_query,
-                                   select="date, contribution_date, transaction_date",
-                                   limit=1,
-                                   order="date DESC NULL LAST")
-        # Get latest expenditure date  
-        expend_query = f"committee_nm='{escaped_name}'"
-        expend_dates = client.get("3adi-mht4",
-                                  where=expend_query,
-                                  select="date, expenditure_date, transaction_date",
-                                  limit=1,
-                                  order="date DESC NULL LAST")
-        
-        latest_date = None
-        for record in contrib_dates:
-            for col in ['date', 'contribution_date', 'transaction_date']:
-                if col in record and record[col]:
-                    try:
-                        date_val = pd.to_datetime(record[col])
-                        if latest_date is None or date_val > latest_date:
-                            latest_date = date_val
-                    except:
-                        pass
-        
-        for record in expend_dates:
-            for col in ['date', 'expenditure_date', 'transaction_date']:
-                if col in record and record[col]:
-                    try:
-                        date_val = pd.to_datetime(record[col])
-                        if latest_date is None or date_val > latest_date:
-                            latest_date = date_val
-                    except:
-                        pass
-        
-        return latest_date
-    except:
-        return None
+@st.cache_resource(ttl=CACHE_BACKSTOP_TTL, max_entries=COMMITTEE_CACHE_MAX_ENTRIES)
+def load_committee_data(committee_name, contributions_version=None, expenditures_version=None,
+                        _show_progress=True):
+    """Contributions and expenditures of a committee, processed and ready to use:
+    typed, with contributor_final/recipient_final resolved, compact dtypes and rows
+    sorted by date for filter_by_period. Cached per committee and dataset versions,
+    so reruns of the detail page do no parsing; only these processed frames stay
+    resident, not the raw downloads. Fetch errors are raised, not cached.
+    The frames are shared by every session without being copied (so that
+    filter_by_period's slices copy nothing), so callers must never modify them.
+    _show_progress (not part of the cache key) is passed to fetch_committee_data."""
+    df_contributions, df_expenditures = fetch_committee_data(
+        committee_name, contributions_version, expenditures_version, show_progress=_show_progress
+    )
+    before = frame_memory(df_contributions) + frame_memory(df_expenditures)
+    df_contributions = compact_transactions(process_contributions(df_contributions))
+    df_expenditures = compact_transactions(process_expenditures(df_expenditures))
+    df_contributions = sort_by_date(df_contributions, find_column(df_contributions, CONTRIBUTION_DATE_COLUMNS))
+    df_expenditures = sort_by_date(df_expenditures, find_column(df_expenditures, EXPENDITURE_DATE_COLUMNS))
+    after = frame_memory(df_contributions) + frame_memory(df_expenditures)
+    logger.info("Cached %s: %.1f MB raw -> %.1f MB processed (%.1fx smaller)", committee_name,
+                before / 1e6, after / 1e6, before / after if after else 1)
+    return df_contributions, df_expenditures
 
-# Step 2: Load committee-specific data
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_committee_data(committee_name):
-    """Fetch all contributions and expenditures for a specific committee with retry logic."""
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    # Escape single quotes in committee name for SoQL query
-    escaped_name = committee_name.replace("'", "''")
+def running_total(df, date_columns, amount_columns, cash_only=False):
+    """RunningTotal of the amounts a frame adds to or takes from Cash on Hand. With
+    cash_only, only cash contributions ("CON", or every row when there is no
+    transaction type column) count."""
+    amount_col = find_column(df, amount_columns)
+    if df.empty or not amount_col:
+        return RunningTotal()
+    amounts = df[amount_col]
+    trans_type_col = find_column(df, TRANSACTION_TYPE_COLUMNS)
+    if cash_only and trans_type_col:
+        amounts = amounts.where(is_cash_contribution(df[trans_type_col]), 0)
+    date_col = find_column(df, date_columns)
+    dates = df[date_col] if date_col else pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    return RunningTotal(dates, amounts)
+
+@st.cache_resource(ttl=CACHE_BACKSTOP_TTL, max_entries=COMMITTEE_CACHE_MAX_ENTRIES)
+def load_cash_index(committee_name, contributions_version=None, expenditures_version=None):
+    """Cash balance index of a committee (see cash_index), built once per committee
+    and dataset versions from its cached frames, so Cash on Hand for any year or
+    date filter is a few lookups instead of a pass over the transactions. Shared
+    read-only by every session rather than unpickled on each rerun."""
+    # Callers load the committee data first, so this is normally a cache hit
+    df_contributions, df_expenditures = load_committee_data(
+        committee_name, contributions_version, expenditures_version, _show_progress=False
+    )
+    return CashBalanceIndex(
+        running_total(df_contributions, CONTRIBUTION_DATE_COLUMNS, CONTRIBUTION_AMOUNT_COLUMNS, cash_only=True),
+        running_total(df_expenditures, EXPENDITURE_DATE_COLUMNS, EXPENDITURE_AMOUNT_COLUMNS)
+    )
+
+@st.cache_resource(ttl=CACHE_BACKSTOP_TTL, max_entries=COMMITTEE_CACHE_MAX_ENTRIES)
+def load_transaction_names(committee_name, contributions_version=None, expenditures_version=None):
+    """Name search over a committee's transactions: a searchable 'name' facet over
+    the distinct contributor_final and recipient_final values of its cached frames
+    (see facet_index), so a query checks each distinct name once instead of
+    scanning every row. Returns (contributions, expenditures) FacetIndexes aligned
+    with the frames load_committee_data returns; either is None without the column."""
+    df_contributions, df_expenditures = load_committee_data(
+        committee_name, contributions_version, expenditures_version, _show_progress=False
+    )
     
-    for attempt in range(max_retries):
-        try:
-            # Fetch contributions
-            contributions_query = f"committee_nm='{escaped_name}'"
-            contributions = client.get("smfg-ds7h", 
-                                       where=contributions_query, 
-                                       select="*",
-                                       limit=500000)
-            df_contributions = pd.DataFrame.from_records(contributions)
-            
-            # Fetch expenditures
-            expenditures_query = f"committee_nm='{escaped_name}'"
-            expenditures = client.get("3adi-mht4", 
-                                      where=expenditures_query, 
-                                      select="*",
-                                      limit=500000)
-            df_expenditures = pd.DataFrame.from_records(expenditures)
-            
-            return df_contributions, df_expenditures
-            
-        except (ConnectionError, requests.exceptions.ConnectionError, OSError) as e:
-            # Connection errors - retry with exponential backoff
-            if attempt < max_retries - 1:
-                wait_time = retry_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
-                time.sleep(wait_time)
-                continue
-            else:
-                st.error(f"Could not fetch committee data after {max_retries} attempts: {str(e)}")
-                return pd.DataFrame(), pd.DataFrame()
-        except Exception as e:
-            # Other errors - don't retry, just return empty
-            st.error(f"Error loading committee data: {str(e)}")
-            return pd.DataFrame(), pd.DataFrame()
+    def names(df, col):
+        if df.empty or col not in df.columns:
+            return None
+        return FacetIndex(df, {'name': col}, searchable=('name',))
     
-    return pd.DataFrame(), pd.DataFrame()
+    return names(df_contributions, 'contributor_final'), names(df_expenditures, 'recipient_final')
+
+def find_transactions(names, df, query):
+    """Rows of df whose name contains query, ignoring case. df is the frame names
+    was built from or a filter_by_period slice of it, whose index is still the row
+    positions sort_by_date gave it."""
+    if names is None or df.empty:
+        return df.iloc[0:0]
+    return df[names.contains('name', query)[df.index.to_numpy()]]
 
-def process_contributions(df):
-    """Process contributions dataframe."""
-    if df.empty:
+# Full-width committee data, only fetched when a CSV export is requested
+@st.cache_data(ttl=CACHE_BACKSTOP_TTL, max_entries=8)
+def load_committee_export(committee_name, dataset_id, version=None):
+    """Fetch every column of one committee's rows of a transaction dataset for CSV
+    export, processed and sorted by date, so reruns only slice the filter period.
+    Errors are raised for the caller to report, so failures aren't cached."""
+    df = get_backend().export_transactions(dataset_id, committee_name)
+    if dataset_id == "smfg-ds7h":
+        df = process_contributions(df)
+        return sort_by_date(df, find_column(df, CONTRIBUTION_DATE_COLUMNS))
+    df = process_expenditures(df)
+    return sort_by_date(df, find_column(df, EXPENDITURE_DATE_COLUMNS))
+
+def filter_by_period(df, date_col, year=None, date_start=None, date_end=None):
+    """Apply the detail page's year and date range filters to a transaction frame
+    sorted by date_col (see sort_by_date). The matching rows are contiguous, so
+    two binary searches find them and the result is a slice of df, not a copy."""
+    if df.empty or not date_col or not (year or date_start or date_end):
         return df
-    
-    df = df.copy()
-    
-    # Create contributor_final column
-    if 'organization_nm' in df.columns and 'first_nm' in df.columns and 'last_nm' in df.columns:
-        df['contributor_final'] = df.apply(
-            lambda row: row['organization_nm'] if pd.notna(row['organization_nm']) and str(row['organization_nm']).strip() != '' 
-            else f"{row.get('first_nm', '')} {row.get('last_nm', '')}".strip(),
-            axis=1
+    start, stop = period_bounds(year, date_start, date_end)
+    # numpy orders NaT after every date, like the undated rows at the end of df,
+    # so an open end still stops before them
+    dates = df[date_col].to_numpy(dtype='datetime64[ns]')
+    lo = dates.searchsorted(start.to_datetime64()) if start is not None else 0
+    hi = dates.searchsorted((stop if stop is not None else pd.NaT).to_datetime64())
+    return df.iloc[lo:max(lo, hi)]
+
+def aggregation_mode_available():
+    """Whether the backend runs server-side aggregates and both transaction datasets
+    have the columns summary mode aggregates on."""
+    backend = get_backend()
+    if not backend.supports_aggregation:
+        return False
+    for dataset_id, columns in AGGREGATION_COLUMNS.items():
+        available = backend.dataset_columns(dataset_id)
+        if not available or not set(columns) <= set(available):
+            return False
+    return True
+
+def submit_aggregate(dataset_id, select, where, group=None, date_columns=(), amount_columns=('amount',),
+                     order=None, limit=None):
+    """Start a grouped SoQL aggregate query on the fetch pool; returns a Future of
+    the (small) result as a DataFrame. Groups come back in group order unless order
+    is given; limit keeps the first groups only. The result always has every
+    selected column, even when no rows match. Identical queries already in flight
+    from other sessions are joined, not repeated, and take no pool worker."""
+    def fetch():
+        df = data_sync.fetch_dataset_pages(
+            client,
+            dataset_id,
+            where=where,
+            select=select,
+            group=group,
+            order=order or group,
+            date_columns=date_columns,
+            amount_columns=amount_columns,
+            limit=limit
         )
+        columns = [part.split(' AS ')[-1].strip() for part in select.split(', ')]
+        return df.reindex(columns=columns)
     
-    # Convert date column to datetime
-    date_columns = ['date', 'contribution_date', 'transaction_date']
-    for col in date_columns:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-    
-    # Convert amount to float
-    amount_columns = ['amount', 'contribution_amount', 'transaction_amount']
-    for col in amount_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    return df
+    return get_single_flight().submit(
+        ('aggregate', dataset_id, select, where, group, order, limit),
+        get_fetch_executor(),
+        fetch
+    )
 
-def process_expenditures(df):
-    """Process expenditures dataframe."""
-    if df.empty:
-        return df
-    
-    df = df.copy()
-    
-    # Convert date column to datetime
-    date_columns = ['date', 'expenditure_date', 'transaction_date']
-    for col in date_columns:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
+def run_aggregates(queries):
+    """Run several submit_aggregate queries in parallel. queries maps a name to its arguments."""
+    futures = {key: submit_aggregate(*args) for key, args in queries.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+# Per-year totals for a committee, computed server-side
+@st.cache_data(ttl=CACHE_BACKSTOP_TTL, max_entries=COMMITTEE_CACHE_MAX_ENTRIES)
+def load_committee_overview(committee_name, contributions_version=None, expenditures_version=None):
+    """Get per-year totals of a committee's contributions (by transaction type) and
+    expenditures from Socrata, with row counts and first/last dates.
+    Small enough to load before deciding whether to download the committee's rows.
+    Errors are raised for the caller to report, so failures aren't cached."""
+    escaped_name = committee_name.replace("'", "''")
+    query = f"committee_nm='{escaped_name}'"
+    return run_aggregates({
+        'contributions': ("smfg-ds7h",
+                          "date_extract_y(date) AS year, transaction_type, sum(amount) AS amount, "
+                          "count(*) AS row_count, min(date) AS first_date, max(date) AS last_date",
+                          query, "date_extract_y(date), transaction_type",
+                          ['first_date', 'last_date'], ['year', 'amount', 'row_count']),
+        'expenditures': ("3adi-mht4",
+                         "date_extract_y(date) AS year, sum(amount) AS amount, "
+                         "count(*) AS row_count, min(date) AS first_date, max(date) AS last_date",
+                         query, "date_extract_y(date)",
+                         ['first_date', 'last_date'], ['year', 'amount', 'row_count'])
+    })
+
+# Aggregates behind the Analysis tab, computed server-side
+@st.cache_data(ttl=CACHE_BACKSTOP_TTL, max_entries=COMMITTEE_CACHE_MAX_ENTRIES)
+def load_committee_aggregates(committee_name, year=None, date_start=None, date_end=None,
+                              contributions_version=None, expenditures_version=None):
+    """Get everything the overview and Analysis tab need for one committee and filter
+    period as a few small grouped SoQL queries instead of every transaction:
+    per-year totals, totals before the period (for starting COH), the largest donors
+    and recipients, per-state totals and donor counts, and monthly donation totals.
+    Errors are raised for the caller to report, so failures aren't cached."""
+    escaped_name = committee_name.replace("'", "''")
+    base_where = f"committee_nm='{escaped_name}'"
+    
+    period_where = base_where
+    if year:
+        period_where += f" AND date_extract_y(date) = {int(year)}"
+    if date_start:
+        period_where += f" AND date >= '{pd.Timestamp(date_start).strftime('%Y-%m-%dT%H:%M:%S')}'"
+    if date_end:
+        period_where += f" AND date <= '{pd.Timestamp(date_end).strftime('%Y-%m-%dT%H:%M:%S')}'"
+    
+    # Rows before the period count toward starting COH
+    period_start = coh_period_start(year, date_start)
+    
+    # A donor is their organization, or their first and last name (see contributor_names).
+    # No ", " inside: submit_aggregate splits the select on it to name the columns
+    donor = "coalesce(organization_nm,coalesce(first_nm,'')||' '||coalesce(last_nm,''))"
+    queries = {
+        'donors': ("smfg-ds7h", "state, organization_nm, first_nm, last_nm, sum(amount) AS amount",
+                   period_where, "state, organization_nm, first_nm, last_nm", (), ('amount',),
+                   "sum(amount) DESC", SUMMARY_TOP_ROWS),
+        'state_totals': ("smfg-ds7h", "state, sum(amount) AS amount",
+                         period_where, "state", (), ('amount',), "sum(amount) DESC", 6),
+        'state_donors': ("smfg-ds7h", f"state, count(distinct {donor}) AS donor_count",
+                         period_where, "state", (), ('donor_count',), f"count(distinct {donor}) DESC", 6),
+        'monthly': ("smfg-ds7h", "date_trunc_ym(date) AS month, sum(amount) AS amount",
+                    period_where, "date_trunc_ym(date)", ['month']),
+        'recipients': ("3adi-mht4", "organization_nm, first_nm, last_nm, state, sum(amount) AS amount",
+                       period_where, "organization_nm, first_nm, last_nm, state", (), ('amount',),
+                       "sum(amount) DESC", SUMMARY_TOP_ROWS)
+    }
+    if period_start is not None:
+        before_where = f"{base_where} AND date < '{period_start.strftime('%Y-%m-%dT%H:%M:%S')}'"
+        queries['contributions_before'] = ("smfg-ds7h", "transaction_type, sum(amount) AS amount",
+                                           before_where, "transaction_type")
+        queries['expenditures_before'] = ("3adi-mht4", "sum(amount) AS amount", before_where)
+    has_filters = year or date_start or date_end
+    if has_filters:
+        queries['contributions'] = ("smfg-ds7h",
+                                    "date_extract_y(date) AS year, transaction_type, sum(amount) AS amount, "
+                                    "count(*) AS row_count, min(date) AS first_date, max(date) AS last_date",
+                                    period_where, "date_extract_y(date), transaction_type",
+                                    ['first_date', 'last_date'], ['year', 'amount', 'row_count'])
+        queries['expenditures'] = ("3adi-mht4",
+                                   "date_extract_y(date) AS year, sum(amount) AS amount, "
+                                   "count(*) AS row_count, min(date) AS first_date, max(date) AS last_date",
+                                   period_where, "date_extract_y(date)",
+                                   ['first_date', 'last_date'], ['year', 'amount', 'row_count'])
+    aggregates = run_aggregates(queries)
+    if not has_filters:
+        # The unfiltered per-year totals are the overview
+        aggregates.update(load_committee_overview(committee_name, contributions_version, expenditures_version))
+    return aggregates
+
+def build_coh_table(contributions_by_period, expenditures_by_period, starting_coh=0, period="Year"):
+    """Build the Cash on Hand by period table from per-period cash contribution and
+    expenditure totals (Series indexed by year, or by pandas Period for quarters
+    and months)."""
+    df_coh = pd.concat(
+        [contributions_by_period.rename('Contributions'), expenditures_by_period.rename('Expenditures')],
+        axis=1
+    ).fillna(0).sort_index()
+    if df_coh.empty:
+        return pd.DataFrame(columns=[period, 'Contributions', 'Expenditures', 'Net', 'Ending COH'])
+    df_coh['Net'] = df_coh['Contributions'] - df_coh['Expenditures']
+    df_coh['Ending COH'] = starting_coh + df_coh['Net'].cumsum()
+    df_coh.index = df_coh.index.astype(int) if period == "Year" else df_coh.index.astype(str)
+    return df_coh.rename_axis(period).reset_index()
+
+def is_cash_contribution(transaction_types):
+    """Mask of transaction types that are cash contributions ("CON")."""
+    return transaction_types.astype(str).str.upper().str.strip() == 'CON'
+
+def coh_period_start(year=None, date_start=None):
+    """Start of a filtered period: everything dated before it makes up starting COH.
+    With both filters it is the earlier of the two; None when neither is set."""
+    period_start = None
+    if year:
+        period_start = pd.Timestamp(int(year), 1, 1)
+    if date_start and (period_start is None or pd.Timestamp(date_start) < period_start):
+        period_start = pd.Timestamp(date_start)
+    return period_start
+
+def period_bounds(year=None, date_start=None, date_end=None):
+    """[start, stop) of the dates the year and date range filters keep; either side
+    is None when it is open."""
+    start = stop = None
+    if year:
+        start, stop = pd.Timestamp(int(year), 1, 1), pd.Timestamp(int(year) + 1, 1, 1)
+    if date_start:
+        start = pd.Timestamp(date_start) if start is None else max(start, pd.Timestamp(date_start))
+    if date_end:
+        # Rows dated up to and including date_end
+        end = pd.Timestamp(date_end) + pd.Timedelta(1, 'ns')
+        stop = end if stop is None else min(stop, end)
+    return start, stop
+
+def compute_cash_on_hand(cash_index, year=None, date_start=None, date_end=None, period="Year"):
+    """Starting COH, ending COH and the Cash on Hand by period table for the detail
+    page, from a committee's cash balance index (see load_cash_index). Every total
+    is a pair of searchsorted lookups, so changing the filters doesn't rescan the
+    transactions. Returns (starting_coh, ending_coh, df_coh); df_coh is None
+    without amount data."""
+    start, stop = period_bounds(year, date_start, date_end)
+    starting_coh = cash_index.balance_before(coh_period_start(year, date_start))
+    ending_coh = starting_coh + cash_index.net_between(start, stop)
+    
+    if not cash_index.has_amounts:
+        return starting_coh, ending_coh, None
+    
+    freq = COH_PERIODS[period]
+    df_coh = build_coh_table(cash_index.contributions.by_period(start, stop, freq),
+                             cash_index.expenditures.by_period(start, stop, freq),
+                             starting_coh, period)
+    return starting_coh, ending_coh, df_coh
+
+def summarize_committee(aggregates, overview, has_filters):
+    """Compute the detail page's totals, Cash on Hand and chart data in summary mode,
+    from load_committee_aggregates and load_committee_overview results."""
+    contrib = aggregates['contributions']
+    expend = aggregates['expenditures']
+    summary = {
+        'total_raised': contrib['amount'].sum(),
+        'total_spent': expend['amount'].sum(),
+        'contribution_count': int(contrib['row_count'].sum()),
+        'expenditure_count': int(expend['row_count'].sum())
+    }
+    
+    period_dates = pd.concat([contrib['first_date'], contrib['last_date'],
+                              expend['first_date'], expend['last_date']]).dropna()
+    summary['earliest_date'] = period_dates.min() if not period_dates.empty else None
+    summary['latest_date'] = period_dates.max() if not period_dates.empty else None
+    all_dates = pd.concat([overview['contributions']['last_date'], overview['expenditures']['last_date']]).dropna()
+    summary['latest_data_date'] = all_dates.max() if not all_dates.empty else None
+    
+    # Cash on Hand - only cash contributions ("CON") count
+    cash_amount = contrib['amount'].where(is_cash_contribution(contrib['transaction_type']), 0)
+    # Like compute_cash_on_hand, a committee with only one side still gets a
+    # balance and a table; the missing side counts as zero
+    starting_coh = 0
+    if has_filters and 'contributions_before' in aggregates:
+        before = aggregates['contributions_before']
+        pre_contrib_total = before.loc[is_cash_contribution(before['transaction_type']), 'amount'].sum()
+        starting_coh = pre_contrib_total - aggregates['expenditures_before']['amount'].sum()
+    summary['starting_coh'] = starting_coh
+    summary['ending_coh'] = starting_coh + cash_amount.sum() - expend['amount'].sum()
+    summary['df_coh'] = build_coh_table(
+        cash_amount.groupby(contrib['year'], observed=True).sum(),
+        expend.groupby('year', observed=True)['amount'].sum(),
+        starting_coh
+    )
     
-    # Convert amount to float
-    amount_columns = ['amount', 'expenditure_amount', 'transaction_amount']
-    for col in amount_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Chart data
+    summary['state_donor_counts'] = pd.Series(dtype=float)
+    summary['state_totals'] = pd.Series(dtype=float)
+    summary['top_donors'] = pd.Series(dtype=float)
+    # Per-state rows come back largest first; a sixth row leaves room for the blank state
+    state_donors = aggregates['state_donors'].dropna(subset=['state'])
+    if not state_donors.empty:
+        summary['state_donor_counts'] = state_donors.set_index('state')['donor_count'].head(5)
+    state_totals = aggregates['state_totals'].dropna(subset=['state'])
+    if not state_totals.empty:
+        summary['state_totals'] = state_totals.set_index('state')['amount'].head(5)
+    donors = process_contributions(aggregates['donors'])
+    if not donors.empty and 'contributor_final' in donors.columns:
+        donor_totals = donors.groupby(['contributor_final', 'state'], observed=True)['amount'].sum().sort_values(ascending=False).head(5)
+        summary['top_donors'] = pd.Series(
+            donor_totals.values,
+            index=[f"{donor} ({state})" for donor, state in donor_totals.index]
+        )
     
-    return df
+    summary['monthly_totals'] = pd.Series(dtype=float)
+    monthly = aggregates['monthly'].dropna(subset=['month'])
+    if not monthly.empty:
+        monthly_totals = monthly.groupby(monthly['month'].dt.to_period('M'), observed=True)['amount'].sum()
+        monthly_totals.index = monthly_totals.index.astype(str)
+        summary['monthly_totals'] = monthly_totals
+    
+    summary['top_recipients'] = None
+    if not expend.empty:
+        summary['top_recipients'] = pd.Series(dtype=float)
+        recipients = aggregates['recipients']
+        if not recipients.empty:
+            recipients = add_recipient_final(recipients)
+            summary['top_recipients'] = recipients.groupby('recipient_final', observed=True)['amount'].sum().sort_values(ascending=False).head(5)
+    return summary
+
+# Activity window of every committee, used by the Activity Since filter and the
+# search results list
+@st.cache_data(ttl=CACHE_BACKSTOP_TTL)
+def get_committee_activity(contributions_version=None, expenditures_version=None):
+    """Get the first and latest contribution and expenditure date for every committee.
+    Uses one grouped query per dataset instead of requests per committee or per date.
+    Returns a DataFrame indexed by committee name, with first_date and latest_date
+    over both datasets. Served from the on-disk cache when it was built from the
+    current dataset versions (see data_sync.sync_committee_activity). Fetch errors
+    are raised, so a partial table is never cached."""
+    return data_sync.sync_committee_activity(get_backend(), contributions_version, expenditures_version)
+
+def get_committees_with_data_since(df_activity, min_date):
+    """Names of committees with a contribution or expenditure dated on or after
+    min_date, compared locally against the activity table."""
+    latest = df_activity['latest_date']
+    return latest.index[latest >= pd.Timestamp(min_date)]
 
 def generate_pdf_report(committee_name, committee_info, total_raised, total_spent, cash_on_hand, 
-                        latest_data_date, df_contributions_filtered, df_expenditures_filtered,
+                        latest_data_date, contribution_count, expenditure_count,
                         df_coh, starting_coh, ending_coh, amount_col_contrib, amount_col_expend,
                         candidate_name=None, earliest_date=None, latest_date=None):
     """Generate a comprehensive PDF report for the committee."""
@@ -689,12 +1004,13 @@ def generate_pdf_report(committee_name, committee_info, total_raised, total_spen
     story.append(Spacer(1, 0.2*inch))
     
     if df_coh is not None and isinstance(df_coh, pd.DataFrame) and not df_coh.empty:
-        # COH by Year table
-        coh_headers = ['Year', 'Contributions', 'Expenditures', 'Net', 'Ending COH']
+        # COH by period table (first column is Year, Quarter or Month)
+        period_col = df_coh.columns[0]
+        coh_headers = [period_col, 'Contributions', 'Expenditures', 'Net', 'Ending COH']
         coh_data = [coh_headers]
         for _, row in df_coh.iterrows():
             coh_data.append([
-                str(int(row['Year'])),
+                str(int(row[period_col])) if period_col == 'Year' else str(row[period_col]),
                 f"${row['Contributions']:,.2f}",
                 f"${row['Expenditures']:,.2f}",
                 f"${row['Net']:,.2f}",
@@ -718,8 +1034,8 @@ def generate_pdf_report(committee_name, committee_info, total_raised, total_spen
     
     # Data Summary
     story.append(Paragraph("<b>Data Summary</b>", styles['Heading2']))
-    story.append(Paragraph(f"<b>Total Contribution Records:</b> {len(df_contributions_filtered)}", styles['Normal']))
-    story.append(Paragraph(f"<b>Total Expenditure Records:</b> {len(df_expenditures_filtered)}", styles['Normal']))
+    story.append(Paragraph(f"<b>Total Contribution Records:</b> {contribution_count}", styles['Normal']))
+    story.append(Paragraph(f"<b>Total Expenditure Records:</b> {expenditure_count}", styles['Normal']))
     
     # Build PDF
     doc.build(story)
@@ -754,149 +1070,142 @@ def get_committee_types_from_categories(categories):
     
     return list(set(committee_types))  # Remove duplicates
 
-def get_filter_options(df_committees, current_filters, exclude_filter=None):
-    """Get available filter options based on current selections.
+def get_filter_masks(search_index, current_filters):
+    """Row mask of each active search filter, keyed like current_filters."""
+    masks = {}
+    facets = search_index.facets
+    
+    selected_categories = current_filters.get('category')
+    if not isinstance(selected_categories, list):
+        selected_categories = [selected_categories] if selected_categories else []
+    if selected_categories and 'committee_type' in facets:
+        committee_types = {str(ct) for ct in get_committee_types_from_categories(selected_categories)}
+        # "Other" also covers types that aren't in any defined category
+        if "Other" in selected_categories:
+            all_known_types = set().union(*COMMITTEE_CATEGORIES.values())
+            committee_types.update(t for t in facets['committee_type'].labels if t not in all_known_types)
+        if committee_types:
+            masks['category'] = search_index.isin('committee_type', committee_types)
+    
+    for key in ['election_year', 'party', 'office', 'district', 'committee_name']:
+        if current_filters.get(key) and key in facets:
+            masks[key] = search_index.isin(key, [str(current_filters[key])])
+    
+    if current_filters.get('candidate_name') and 'candidate_name' in facets:
+        masks['candidate_name'] = search_index.contains('candidate_name', str(current_filters['candidate_name']))
+    
+    # Free-text name search matches committee or candidate names
+    name_search = current_filters.get('name_search')
+    if name_search:
+        name_masks = [search_index.contains(key, name_search)
+                      for key in ['committee_name', 'candidate_name'] if key in facets]
+        if name_masks:
+            masks['name_search'] = np.logical_or.reduce(name_masks)
+    return masks
+
+def get_filter_options(search_index, filter_masks, active_rows, exclude_filter=None):
+    """Get available filter options based on current selections, as a dict of
+    option lists keyed by facet, plus the mask of the matching committees.
     exclude_filter: name of filter to exclude from filtering (so it shows all options)"""
-    filtered_df = df_committees.copy()
-    
-    # Apply existing filters progressively, but exclude the filter we're getting options for
-    if current_filters.get('category') and exclude_filter != 'category':
-        # Convert categories to committee types
-        selected_categories = current_filters['category']
-        if not isinstance(selected_categories, list):
-            selected_categories = [selected_categories] if selected_categories else []
-        
-        if selected_categories:
-            # Get committee types from selected categories
-            committee_types = get_committee_types_from_categories(selected_categories)
-            
-            # Handle "Other" category - include types not in other categories
-            if "Other" in selected_categories:
-                # Get all known types from defined categories
-                all_known_types = set()
-                for cat_types in COMMITTEE_CATEGORIES.values():
-                    all_known_types.update(cat_types)
-                
-                # Find committee type column
-                type_col = None
-                for col in ['committee_type', 'type', 'type_nm', 'committee_type_nm']:
-                    if col in filtered_df.columns:
-                        type_col = col
-                        break
-                
-                if type_col:
-                    # Add types that are not in any defined category
-                    all_types_in_data = set(filtered_df[type_col].dropna().astype(str).unique())
-                    other_types = all_types_in_data - all_known_types
-                    committee_types.extend(list(other_types))
-            
-            if committee_types:
-                for col in ['committee_type', 'type', 'type_nm', 'committee_type_nm']:
-                    if col in filtered_df.columns:
-                        filtered_df = filtered_df[filtered_df[col].astype(str).isin([str(ct) for ct in committee_types])]
-                        break
-    
-    if current_filters.get('election_year') and exclude_filter != 'election_year':
-        # Try different possible column names
-        for col in ['election_year', 'election_yr', 'year', 'election_year_text']:
-            if col in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col].astype(str) == str(current_filters['election_year'])]
-                break
-    
-    if current_filters.get('party') and exclude_filter != 'party':
-        for col in ['party', 'party_nm', 'party_name', 'political_party']:
-            if col in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col].astype(str) == str(current_filters['party'])]
-                break
-    
-    if current_filters.get('office') and exclude_filter != 'office':
-        for col in ['office', 'office_sought', 'office_nm', 'office_name']:
-            if col in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col].astype(str) == str(current_filters['office'])]
-                break
-    
-    if current_filters.get('district') and exclude_filter != 'district':
-        for col in ['district', 'district_nbr', 'district_number', 'district_num']:
-            if col in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col].astype(str) == str(current_filters['district'])]
-                break
-    
-    if current_filters.get('candidate_name') and exclude_filter != 'candidate_name':
-        for col in ['candidate_name', 'candidate_nm', 'candidate', 'name']:
-            if col in filtered_df.columns:
-                # Use contains for candidate name
-                filtered_df = filtered_df[filtered_df[col].astype(str).str.contains(str(current_filters['candidate_name']), case=False, na=False)]
-                break
-    
-    if current_filters.get('committee_name') and exclude_filter != 'committee_name':
-        for col in ['committee_name', 'committee_nm', 'committee']:
-            if col in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col].astype(str) == str(current_filters['committee_name'])]
-                break
-    
-    # Get unique values for each filter
-    options = {}
-    
-    # Committee Type
-    for col in ['committee_type', 'type', 'type_nm', 'committee_type_nm']:
-        if col in filtered_df.columns:
-            types = sorted(filtered_df[col].dropna().unique())
-            options['committee_type'] = [str(t) for t in types if str(t).strip() != '']
-            break
-    
-    # Election Year
-    for col in ['election_year', 'election_yr', 'year', 'election_year_text']:
-        if col in filtered_df.columns:
-            years = sorted(filtered_df[col].dropna().unique(), reverse=True)
-            options['election_year'] = [str(y) for y in years]
-            break
-    
-    # Party
-    for col in ['party', 'party_nm', 'party_name', 'political_party']:
-        if col in filtered_df.columns:
-            parties = sorted(filtered_df[col].dropna().unique())
-            options['party'] = [str(p) for p in parties if str(p).strip() != '']
-            break
-    
-    # Office
-    for col in ['office', 'office_sought', 'office_nm', 'office_name']:
-        if col in filtered_df.columns:
-            offices = sorted(filtered_df[col].dropna().unique())
-            options['office'] = [str(o) for o in offices if str(o).strip() != '']
-            break
-    
-    # District
-    for col in ['district', 'district_nbr', 'district_number', 'district_num']:
-        if col in filtered_df.columns:
-            districts = sorted(filtered_df[col].dropna().unique())
-            options['district'] = [str(d) for d in districts if str(d).strip() != '']
-            break
-    
-    # Candidate Name (for search)
-    for col in ['candidate_name', 'candidate_nm', 'candidate', 'name']:
-        if col in filtered_df.columns:
-            candidates = sorted(filtered_df[col].dropna().unique())
-            options['candidate_name'] = [str(c) for c in candidates if str(c).strip() != '']
-            break
-    
-    # Committee Name
-    for col in ['committee_name', 'committee_nm', 'committee']:
-        if col in filtered_df.columns:
-            committees = sorted(filtered_df[col].dropna().unique())
-            options['committee_name'] = [str(c) for c in committees if str(c).strip() != '']
-            break
-    
-    return options, filtered_df
+    rows = active_rows.copy()
+    for key, mask in filter_masks.items():
+        if key != exclude_filter:
+            rows &= mask
+    if exclude_filter is None:
+        return {}, rows
+    return {exclude_filter: search_index.options(exclude_filter, rows)}, rows
+
+def first_present(df, candidates):
+    """Per row, the first non-null value among the candidate columns df has, as a
+    string ('' when all are null)."""
+    values = pd.Series(None, index=df.index, dtype=object)
+    for col in candidates:
+        if col in df.columns:
+            values = values.where(values.notna(), df[col].astype(object))
+    return values.map(str, na_action='ignore').fillna('')
 
-# Load committee dataset
-df_committees = load_committee_dataset()
+def build_search_results(df, committee_col, name_rank=None):
+    """One row per committee (its first row in df) with its name, type, office and
+    party, sorted by name, or by name_rank (committee name -> rank, best first)
+    when given, with unranked committees last."""
+    df = df.dropna(subset=[committee_col]).drop_duplicates(subset=[committee_col])
+    results = pd.DataFrame({
+        'name': df[committee_col],
+        'type': first_present(df, SEARCH_FACETS['committee_type']),
+        'office': first_present(df, SEARCH_FACETS['office']),
+        'party': first_present(df, SEARCH_FACETS['party'])
+    })
+    sort_by = ['name']
+    if name_rank is not None:
+        results['rank'] = results['name'].astype(str).map(name_rank).fillna(len(name_rank))
+        sort_by = ['rank', 'name']
+    return results.sort_values(sort_by, kind='stable', ignore_index=True)
+
+def warm_caches():
+    """Populate the caches behind the default search view (Statewide, active since
+    DEFAULT_START_DATE) and the detail pages of the most viewed committees.
+    Runs on a background thread with no ScriptRunContext, so everything it calls
+    must not write Streamlit output: the cached loaders raise instead of showing
+    errors, and committee data loads without its progress line."""
+    try:
+        versions = get_dataset_versions()
+        contributions_version, expenditures_version = versions["smfg-ds7h"], versions["3adi-mht4"]
+        get_committee_search(versions["5dtu-swbk"])
+        get_committee_activity(contributions_version, expenditures_version)
+    except Exception:
+        return
+    
+    def warm_committee(committee_name):
+        try:
+            # Mirror the detail page: large committees open in summary mode
+            if aggregation_mode_available():
+                overview = load_committee_overview(committee_name, contributions_version, expenditures_version)
+                overview_rows = overview['contributions']['row_count'].sum() + overview['expenditures']['row_count'].sum()
+                if overview_rows > AGGREGATION_MODE_MIN_ROWS:
+                    return
+            load_committee_data(committee_name, contributions_version, expenditures_version, _show_progress=False)
+            load_cash_index(committee_name, contributions_version, expenditures_version)
+        except Exception:
+            pass
+    
+    # Each committee load fetches both datasets, so this bounds in-flight requests
+    # to twice the concurrency
+    with ThreadPoolExecutor(max_workers=warm_cache.WARMUP_CONCURRENCY, thread_name_prefix="cache-warmer") as pool:
+        list(pool.map(warm_committee, data_store.most_viewed_committees(warm_cache.WARMUP_TOP_COMMITTEES)))
+
+@st.cache_resource
+def start_cache_warmer():
+    """Run warm_caches in a background thread, once per process. Streamlit runs this
+    script per session, so that is when the first session connects, not when the
+    server starts; warm_cache.py fills the disk cache before then."""
+    if not warm_cache.WARMUP_ON_START:
+        return None
+    thread = threading.Thread(target=warm_caches, name="cache-warmer", daemon=True)
+    thread.start()
+    return thread
+
+start_cache_warmer()
+
+# Current dataset versions - every data cache below is keyed on them
+dataset_versions = get_dataset_versions()
+
+# Load committee dataset, with the search index built from the same frame
+try:
+    df_committees, search_index = get_committee_search(dataset_versions["5dtu-swbk"])
+except requests.exceptions.RequestException as e:
+    # The client has already retried connection errors and throttling
+    st.error(f"Could not fetch committees: {str(e)}")
+    df_committees, search_index = pd.DataFrame(), None
+except Exception as e:
+    st.error(f"Error loading committee dataset: {str(e)}")
+    df_committees, search_index = pd.DataFrame(), None
 
 if df_committees.empty:
     st.error("Unable to load committee data. Please check your connection.")
     st.stop()
 
 # Get dataset metadata
-dataset_update_time = get_dataset_metadata()
+dataset_update_time = dataset_versions["5dtu-swbk"]
 update_time_str = None
 if dataset_update_time:
     try:
@@ -950,7 +1259,8 @@ if st.session_state.selected_committee is None:
             'office': None,
             'district': None,
             'candidate_name': None,
-            'committee_name': None
+            'committee_name': None,
+            'name_search': None
         }
     
     # Helper function to get index for selectbox
@@ -980,11 +1290,13 @@ if st.session_state.selected_committee is None:
                     'office': None,
                     'district': None,
                     'candidate_name': None,
-                    'committee_name': None
+                    'committee_name': None,
+                    'name_search': None
                 }
                 # Reset date filter to default
                 st.session_state.date_filter_value = DEFAULT_START_DATE
                 st.session_state.filter_reset_counter += 1
+                st.session_state.results_page = 0
                 st.rerun()
         
         # Filter by Activity Since date input - using dynamic key for reset capability
@@ -1004,38 +1316,36 @@ if st.session_state.selected_committee is None:
         
         st.markdown("---")
         
+        # Activity window of every committee, for the date filter and the results list
+        try:
+            df_activity = get_committee_activity(dataset_versions["smfg-ds7h"], dataset_versions["3adi-mht4"])
+        except Exception as e:
+            st.warning(f"Could not fetch committee activity dates: {str(e)}")
+            df_activity = None
+        
         # Get committees with data since the selected date
         committees_with_data = set()
-        if st.session_state.date_filter_value:
-            committees_with_data = set(get_committees_with_data_since(st.session_state.date_filter_value))
+        if st.session_state.date_filter_value and df_activity is not None:
+            committees_with_data = set(get_committees_with_data_since(df_activity, st.session_state.date_filter_value))
         
-        # Filter df_committees by minimum date if filter is enabled
-        df_committees_filtered = df_committees.copy()
-        if st.session_state.date_filter_value and committees_with_data:
-            # Filter to only committees with data since the selected date
-            committee_col = None
-            for col in ['committee_name', 'committee_nm', 'committee']:
-                if col in df_committees_filtered.columns:
-                    committee_col = col
-                    break
-            if committee_col:
-                df_committees_filtered = df_committees_filtered[
-                    df_committees_filtered[committee_col].isin(committees_with_data)
-                ]
+        # Limit the committees to those with data since the minimum date if filter is enabled
+        active_rows = search_index.all_rows()
+        if st.session_state.date_filter_value and committees_with_data and 'committee_name' in search_index.facets:
+            active_rows = search_index.isin('committee_name', committees_with_data)
         
         # Get filter options for each dropdown (excluding itself from filtering)
-        filter_options_category, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='category')
-        filter_options_party, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='party')
-        filter_options_office, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='office')
-        filter_options_district, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='district')
-        filter_options_candidate, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='candidate_name')
-        filter_options_committee, _ = get_filter_options(df_committees_filtered, st.session_state.filters, exclude_filter='committee_name')
+        filter_masks = get_filter_masks(search_index, st.session_state.filters)
+        filter_options_party, _ = get_filter_options(search_index, filter_masks, active_rows, exclude_filter='party')
+        filter_options_office, _ = get_filter_options(search_index, filter_masks, active_rows, exclude_filter='office')
+        filter_options_district, _ = get_filter_options(search_index, filter_masks, active_rows, exclude_filter='district')
+        filter_options_candidate, _ = get_filter_options(search_index, filter_masks, active_rows, exclude_filter='candidate_name')
+        filter_options_committee, _ = get_filter_options(search_index, filter_masks, active_rows, exclude_filter='committee_name')
         
         # Track if any filter changed
         filter_changed = False
         
         # Committee Category filter
-        category_options = filter_options_category.get('category', list(COMMITTEE_CATEGORIES.keys()))
+        category_options = list(COMMITTEE_CATEGORIES.keys())
         current_categories = st.session_state.filters.get('category', ["Statewide"])
         # Ensure current_categories is a list
         if not isinstance(current_categories, list):
@@ -1054,6 +1364,18 @@ if st.session_state.selected_committee is None:
             st.session_state.filters['category'] = selected_categories
             filter_changed = True
         
+        # Name search, answered from the trigram index over committee and candidate names
+        current_name_search = st.session_state.filters.get('name_search')
+        name_search = st.text_input(
+            "Search Names",
+            value=current_name_search or "",
+            placeholder="Committee or candidate name",
+            key=f"filter_name_search_{st.session_state.filter_reset_counter}"
+        ).strip() or None
+        if name_search != current_name_search:
+            st.session_state.filters['name_search'] = name_search
+            filter_changed = True
+        
         party_options = [None] + filter_options_party.get('party', [])
         current_party = st.session_state.filters.get('party')
         selected_party = st.selectbox(
@@ -1116,20 +1438,13 @@ if st.session_state.selected_committee is None:
         
         # Rerun if any filter changed
         if filter_changed:
+            st.session_state.results_page = 0
             st.rerun()
         
         # Calculate result count for mobile display
         # Get filtered committees count
-        _, filtered_committees = get_filter_options(df_committees_filtered, st.session_state.filters)
-        committee_col = None
-        for col in ['committee_name', 'committee_nm', 'committee']:
-            if col in filtered_committees.columns:
-                committee_col = col
-                break
-        
-        result_count = 0
-        if committee_col:
-            result_count = len(filtered_committees[committee_col].dropna().unique())
+        _, matching_rows = get_filter_options(search_index, filter_masks, active_rows)
+        result_count = search_index.count('committee_name', matching_rows)
         
         st.markdown("---")
         
@@ -1161,8 +1476,7 @@ if st.session_state.selected_committee is None:
     
     # Main content area - Results
     # Get filtered committees (already filtered by 2025 data if checkbox is checked)
-    _, filtered_committees = get_filter_options(df_committees_filtered, st.session_state.filters)
-    final_filtered = filtered_committees.copy()
+    final_filtered = df_committees[matching_rows]
     
     # Get committee name column
     committee_col = None
@@ -1180,6 +1494,7 @@ if st.session_state.selected_committee is None:
         st.session_state.filters.get('district') is None and
         st.session_state.filters.get('candidate_name') is None and
         st.session_state.filters.get('committee_name') is None and
+        st.session_state.filters.get('name_search') is None and
         st.session_state.date_filter_value == DEFAULT_START_DATE
     )
     
@@ -1189,48 +1504,29 @@ if st.session_state.selected_committee is None:
         st.markdown("Filter by committee info. Defaults to statewides with data since 2024. Close the sidebar by clicking arrows at the top")
     
     if committee_col:
-        # Get unique committees with their info
-        committee_info_list = []
-        for committee in final_filtered[committee_col].dropna().unique():
-            committee_row = final_filtered[final_filtered[committee_col] == committee].iloc[0]
-            
-            # Get committee type
-            committee_type_val = None
-            for col in ['committee_type', 'type', 'type_nm', 'committee_type_nm']:
-                if col in committee_row and pd.notna(committee_row[col]):
-                    committee_type_val = str(committee_row[col])
-                    break
-            
-            # Get office
-            office_val = None
-            for col in ['office', 'office_sought', 'office_nm', 'office_name']:
-                if col in committee_row and pd.notna(committee_row[col]):
-                    office_val = str(committee_row[col])
-                    break
-            
-            # Get party
-            party_val = None
-            for col in ['party', 'party_nm', 'party_name', 'political_party']:
-                if col in committee_row and pd.notna(committee_row[col]):
-                    party_val = str(committee_row[col])
-                    break
-            
-            committee_info_list.append({
-                'name': committee,
-                'type': committee_type_val,
-                'office': office_val,
-                'party': party_val
-            })
-        
-        # Sort by name
-        committee_info_list = sorted(committee_info_list, key=lambda x: x['name'])
+        # Best name match first when searching by name, otherwise by name
+        name_rank = None
+        name_search = st.session_state.filters.get('name_search')
+        if name_search and 'committee_name' in search_index.facets:
+            name_rank = {name: i for i, name in enumerate(search_index.search('committee_name', name_search))}
+        results = build_search_results(final_filtered, committee_col, name_rank)
         
         # Display results with better aesthetics
-        if committee_info_list:
-            st.markdown(f"### {len(committee_info_list)} Committee{'s' if len(committee_info_list) != 1 else ''} Found")
+        if not results.empty:
+            st.markdown(f"### {len(results)} Committee{'s' if len(results) != 1 else ''} Found")
+            
+            # Only the current page is rendered
+            page_count = (len(results) - 1) // RESULTS_PAGE_SIZE + 1
+            page = min(st.session_state.results_page, page_count - 1)
+            page_start = page * RESULTS_PAGE_SIZE
+            page_results = results.iloc[page_start:page_start + RESULTS_PAGE_SIZE]
+            
+            # Latest activity for the committees on this page, from the batch lookup
+            latest_dates = df_activity['latest_date'] if df_activity is not None else pd.Series(dtype='datetime64[ns]')
+            page_latest = latest_dates.reindex(page_results['name']).tolist()
             
             # Create a compact, single-line list
-            for i, committee_info in enumerate(committee_info_list):
+            for i, (committee_info, latest_date) in enumerate(zip(page_results.to_dict('records'), page_latest), start=page_start):
                 details_parts = []
                 if committee_info['type']:
                     details_parts.append(committee_info['type'])
@@ -1240,8 +1536,7 @@ if st.session_state.selected_committee is None:
                     details_parts.append(committee_info['party'])
                 
                 # Get latest data date
-                latest_date = get_committee_latest_date(committee_info['name'])
-                if latest_date:
+                if pd.notna(latest_date):
                     if hasattr(latest_date, 'strftime'):
                         latest_date_str = latest_date.strftime('%Y-%m-%d')
                     else:
@@ -1262,7 +1557,25 @@ if st.session_state.selected_committee is None:
                     use_container_width=True
                 ):
                     st.session_state.selected_committee = committee_info['name']
+                    data_store.record_committee_view(committee_info['name'])
                     st.rerun()
+            
+            if page_count > 1:
+                prev_col, page_col, next_col = st.columns([1, 2, 1])
+                with prev_col:
+                    if st.button("← Previous", disabled=page == 0, use_container_width=True, key="results_prev"):
+                        st.session_state.results_page = page - 1
+                        st.rerun()
+                with page_col:
+                    st.markdown(
+                        f"<p style='text-align: center;'>Page {page + 1} of {page_count} "
+                        f"({page_start + 1}–{page_start + len(page_results)} of {len(results)})</p>",
+                        unsafe_allow_html=True
+                    )
+                with next_col:
+                    if st.button("Next →", disabled=page == page_count - 1, use_container_width=True, key="results_next"):
+                        st.session_state.results_page = page + 1
+                        st.rerun()
         else:
             st.info("No committees match the selected filters. Please adjust your search criteria.")
     else:
@@ -1286,33 +1599,74 @@ elif st.session_state.selected_committee:
     # Get committee info from dataset
     committee_info = df_committees[df_committees[committee_col_detail] == st.session_state.selected_committee].iloc[0] if not df_committees.empty and committee_col_detail else None
     
-    # Load committee data
-    with st.spinner(f"Loading data for {st.session_state.selected_committee}..."):
-        df_contributions, df_expenditures = load_committee_data(st.session_state.selected_committee)
+    # Per-year totals from Socrata decide whether the committee is big enough to
+    # open in summary mode (aggregates only, no transaction download)
+    overview = None
+    if aggregation_mode_available():
+        try:
+            with st.spinner(f"Loading summary for {st.session_state.selected_committee}..."):
+                overview = load_committee_overview(
+                    st.session_state.selected_committee,
+                    dataset_versions["smfg-ds7h"],
+                    dataset_versions["3adi-mht4"]
+                )
+        except Exception as e:
+            st.warning(f"Could not load committee summary: {str(e)}")
+    
+    with st.sidebar:
+        st.header("Filters")
+        
+        summary_mode = False
+        if overview is not None:
+            overview_rows = overview['contributions']['row_count'].sum() + overview['expenditures']['row_count'].sum()
+            summary_mode = st.toggle(
+                "Summary mode",
+                value=bool(overview_rows > AGGREGATION_MODE_MIN_ROWS),
+                key=f"summary_mode_{st.session_state.selected_committee}",
+                help="Compute totals and charts on the server instead of downloading every transaction."
+            )
     
-    # Process data
-    df_contributions = process_contributions(df_contributions)
-    df_expenditures = process_expenditures(df_expenditures)
+    if summary_mode:
+        # Transactions stay on the server; the page renders from aggregates
+        df_contributions, df_expenditures = pd.DataFrame(), pd.DataFrame()
+    else:
+        # Load committee data, already processed so reruns don't re-parse it
+        try:
+            with st.spinner(f"Loading data for {st.session_state.selected_committee}..."):
+                df_contributions, df_expenditures = load_committee_data(
+                    st.session_state.selected_committee,
+                    dataset_versions["smfg-ds7h"],
+                    dataset_versions["3adi-mht4"]
+                )
+            committee_data_loaded = True
+        except requests.exceptions.RequestException as e:
+            # The client has already retried connection errors and throttling
+            st.error(f"Could not fetch committee data: {str(e)}")
+            df_contributions, df_expenditures = pd.DataFrame(), pd.DataFrame()
+            committee_data_loaded = False
+        except Exception as e:
+            st.error(f"Error loading committee data: {str(e)}")
+            df_contributions, df_expenditures = pd.DataFrame(), pd.DataFrame()
+            committee_data_loaded = False
     
     # Find date columns
-    date_col_contrib = None
-    for col in ['date', 'contribution_date', 'transaction_date']:
-        if col in df_contributions.columns:
-            date_col_contrib = col
-            break
+    date_col_contrib = find_column(df_contributions, CONTRIBUTION_DATE_COLUMNS)
+    date_col_expend = find_column(df_expenditures, EXPENDITURE_DATE_COLUMNS)
     
-    date_col_expend = None
-    for col in ['date', 'expenditure_date', 'transaction_date']:
-        if col in df_expenditures.columns:
-            date_col_expend = col
-            break
+    if summary_mode:
+        # Summary mode aggregates on the 'date' columns
+        date_col_contrib = date_col_expend = 'date'
+        overview_dates = pd.concat([overview['contributions']['first_date'], overview['contributions']['last_date']]).dropna()
+        overview_years = overview['contributions']['year']
+        if overview_years.dropna().empty:
+            overview_years = overview['expenditures']['year']
     
     # Sidebar for filters
     with st.sidebar:
-        st.header("Filters")
-        
         # Year filter
-        if date_col_contrib and not df_contributions.empty:
+        if summary_mode:
+            all_years = sorted(overview_years.dropna().astype(int).unique(), reverse=True)
+        elif date_col_contrib and not df_contributions.empty:
             all_years = sorted(df_contributions[date_col_contrib].dropna().dt.year.unique(), reverse=True)
         elif date_col_expend and not df_expenditures.empty:
             all_years = sorted(df_expenditures[date_col_expend].dropna().dt.year.unique(), reverse=True)
@@ -1352,6 +1706,8 @@ elif st.session_state.selected_committee:
         if use_date_range:
             if st.session_state.filter_date_start:
                 default_start = st.session_state.filter_date_start
+            elif summary_mode and not overview_dates.empty:
+                default_start = overview_dates.min().date()
             elif date_col_contrib and not df_contributions.empty:
                 default_start = df_contributions[date_col_contrib].min().date()
             else:
@@ -1359,6 +1715,8 @@ elif st.session_state.selected_committee:
             
             if st.session_state.filter_date_end:
                 default_end = st.session_state.filter_date_end
+            elif summary_mode and not overview_dates.empty:
+                default_end = overview_dates.max().date()
             elif date_col_contrib and not df_contributions.empty:
                 default_end = df_contributions[date_col_contrib].max().date()
             else:
@@ -1399,44 +1757,21 @@ elif st.session_state.selected_committee:
         )
         st.markdown("</div>", unsafe_allow_html=True)
     
-    # Apply filters to data with error handling
-    df_contributions_filtered = df_contributions.copy()
-    df_expenditures_filtered = df_expenditures.copy()
+    # Apply filters to data with error handling. The cached frames are sorted by
+    # date, so each filtered frame is a slice of them rather than a copy
+    df_contributions_filtered = df_contributions
+    df_expenditures_filtered = df_expenditures
     
     filter_error = False
     try:
-        if st.session_state.filter_year and date_col_contrib:
-            if not df_contributions_filtered.empty:
-                df_contributions_filtered = df_contributions_filtered[
-                    df_contributions_filtered[date_col_contrib].dt.year == int(st.session_state.filter_year)
-                ]
-        if st.session_state.filter_year and date_col_expend:
-            if not df_expenditures_filtered.empty:
-                df_expenditures_filtered = df_expenditures_filtered[
-                    df_expenditures_filtered[date_col_expend].dt.year == int(st.session_state.filter_year)
-                ]
-        
-        if st.session_state.filter_date_start and date_col_contrib:
-            if not df_contributions_filtered.empty:
-                df_contributions_filtered = df_contributions_filtered[
-                    df_contributions_filtered[date_col_contrib] >= pd.Timestamp(st.session_state.filter_date_start)
-                ]
-        if st.session_state.filter_date_end and date_col_contrib:
-            if not df_contributions_filtered.empty:
-                df_contributions_filtered = df_contributions_filtered[
-                    df_contributions_filtered[date_col_contrib] <= pd.Timestamp(st.session_state.filter_date_end)
-                ]
-        
-        if st.session_state.filter_date_start and date_col_expend:
-            if not df_expenditures_filtered.empty:
-                df_expenditures_filtered = df_expenditures_filtered[
-                    df_expenditures_filtered[date_col_expend] >= pd.Timestamp(st.session_state.filter_date_start)
-                ]
-        if st.session_state.filter_date_end and date_col_expend:
-            if not df_expenditures_filtered.empty:
-                df_expenditures_filtered = df_expenditures_filtered[
-                    df_expenditures_filtered[date_col_expend] <= pd.Timestamp(st.session_state.filter_date_end)
-                ]
+        df_contributions_filtered = filter_by_period(
+            df_contributions, date_col_contrib, st.session_state.filter_year,
+            st.session_state.filter_date_start, st.session_state.filter_date_end
+        )
+        df_expenditures_filtered = filter_by_period(
+            df_expenditures, date_col_expend, st.session_state.filter_year,
+            st.session_state.filter_date_start, st.session_state.filter_date_end
+        )
     except Exception as e:
         filter_error = True
         st.warning(f"Error applying filters: {str(e)}. Filters have been reset.")
@@ -1444,10 +1779,43 @@ elif st.session_state.selected_committee:
         st.session_state.filter_year = None
         st.session_state.filter_date_start = None
         st.session_state.filter_date_end = None
-        df_contributions_filtered = df_contributions.copy()
-        df_expenditures_filtered = df_expenditures.copy()
+        df_contributions_filtered = df_contributions
+        df_expenditures_filtered = df_expenditures
         st.rerun()
     
+    # Summary mode: totals, COH and charts come from Socrata aggregates
+    summary = None
+    if summary_mode:
+        aggregates = None
+        with st.spinner(f"Loading summary for {st.session_state.selected_committee}..."):
+            try:
+                aggregates = load_committee_aggregates(
+                    st.session_state.selected_committee,
+                    st.session_state.filter_year,
+                    st.session_state.filter_date_start,
+                    st.session_state.filter_date_end,
+                    dataset_versions["smfg-ds7h"],
+                    dataset_versions["3adi-mht4"]
+                )
+            except Exception as e:
+                st.warning(f"Could not load committee summary: {str(e)}")
+        if aggregates is None:
+            st.warning("Summary data is unavailable. Turn off Summary mode in the sidebar to load all transactions.")
+            st.stop()
+        summary = summarize_committee(
+            aggregates, overview,
+            st.session_state.filter_year is not None or
+            st.session_state.filter_date_start is not None or
+            st.session_state.filter_date_end is not None
+        )
+    
+    if summary_mode:
+        contribution_count = summary['contribution_count']
+        expenditure_count = summary['expenditure_count']
+    else:
+        contribution_count = len(df_contributions_filtered)
+        expenditure_count = len(df_expenditures_filtered)
+    
     # Overview Info Section - Condensed
     st.header(f"{st.session_state.selected_committee}")
     
@@ -1482,17 +1850,8 @@ elif st.session_state.selected_committee:
                 break
     
     # Calculate totals from filtered data
-    amount_col_contrib = None
-    for col in ['amount', 'contribution_amount', 'transaction_amount']:
-        if col in df_contributions_filtered.columns:
-            amount_col_contrib = col
-            break
-    
-    amount_col_expend = None
-    for col in ['amount', 'expenditure_amount', 'transaction_amount']:
-        if col in df_expenditures_filtered.columns:
-            amount_col_expend = col
-            break
+    amount_col_contrib = find_column(df_contributions_filtered, CONTRIBUTION_AMOUNT_COLUMNS)
+    amount_col_expend = find_column(df_expenditures_filtered, EXPENDITURE_AMOUNT_COLUMNS)
     
     total_raised = df_contributions_filtered[amount_col_contrib].sum() if amount_col_contrib and not df_contributions_filtered.empty else 0
     total_spent = df_expenditures_filtered[amount_col_expend].sum() if amount_col_expend and not df_expenditures_filtered.empty else 0
@@ -1531,6 +1890,14 @@ elif st.session_state.selected_committee:
         else:
             latest_data_date_unfiltered = str(latest_date_unfiltered)
     
+    if summary_mode:
+        total_raised = summary['total_raised']
+        total_spent = summary['total_spent']
+        earliest_date = summary['earliest_date']
+        latest_date = summary['latest_date']
+        if summary['latest_data_date'] is not None:
+            latest_data_date_unfiltered = summary['latest_data_date'].strftime('%Y-%m-%d')
+    
     # Compact info row
     info_text = f"{name}"
     if committee_type:
@@ -1553,71 +1920,26 @@ elif st.session_state.selected_committee:
     else:
         st.markdown("**Latest Data Available:** NO DATA")
     
-    # Calculate Cash on Hand to match Ending COH
-    has_filters = (st.session_state.filter_year is not None or 
-                  st.session_state.filter_date_start is not None or 
-                  st.session_state.filter_date_end is not None)
-    
-    # Find transaction type column for contributions
-    trans_type_col = None
-    for col in ['transaction_type', 'trans_type', 'type', 'contribution_type', 'transaction_cd', 'trans_cd']:
-        if col in df_contributions.columns:
-            trans_type_col = col
-            break
-    
-    # Filter contributions to only include "CON" (cash contributions) for COH
-    def filter_cash_contributions(df):
-        if df.empty or trans_type_col is None:
-            return df
-        filtered = df[df[trans_type_col].astype(str).str.upper().str.strip() == 'CON'].copy()
-        return filtered
-    
-    # Calculate starting COH
-    starting_coh = 0
-    if has_filters and not df_contributions.empty and not df_expenditures.empty:
-        pre_filter_contrib = df_contributions.copy()
-        pre_filter_expend = df_expenditures.copy()
-        pre_filter_contrib = filter_cash_contributions(pre_filter_contrib)
-        
-        if st.session_state.filter_year and date_col_contrib:
-            pre_filter_contrib = pre_filter_contrib[
-                pre_filter_contrib[date_col_contrib].dt.year < int(st.session_state.filter_year)
-            ]
-        if st.session_state.filter_year and date_col_expend:
-            pre_filter_expend = pre_filter_expend[
-                pre_filter_expend[date_col_expend].dt.year < int(st.session_state.filter_year)
-            ]
-        if st.session_state.filter_date_start and date_col_contrib:
-            pre_filter_contrib = pre_filter_contrib[
-                pre_filter_contrib[date_col_contrib] < pd.Timestamp(st.session_state.filter_date_start)
-            ]
-        if st.session_state.filter_date_start and date_col_expend:
-            pre_filter_expend = pre_filter_expend[
-                pre_filter_expend[date_col_expend] < pd.Timestamp(st.session_state.filter_date_start)
-            ]
-        
-        if amount_col_contrib and not pre_filter_contrib.empty:
-            pre_contrib_total = pre_filter_contrib[amount_col_contrib].sum()
-        else:
-            pre_contrib_total = 0
-        if amount_col_expend and not pre_filter_expend.empty:
-            pre_expend_total = pre_filter_expend[amount_col_expend].sum()
-        else:
-            pre_expend_total = 0
-        starting_coh = pre_contrib_total - pre_expend_total
-    
-    # Calculate ending COH (same as in Analysis tab)
-    ending_coh = starting_coh
-    if has_filters:
-        cash_contributions_filtered = filter_cash_contributions(df_contributions_filtered)
-        total_contrib = cash_contributions_filtered[amount_col_contrib].sum() if amount_col_contrib and not cash_contributions_filtered.empty else 0
-        total_expend = df_expenditures_filtered[amount_col_expend].sum() if amount_col_expend and not df_expenditures_filtered.empty else 0
-        ending_coh = starting_coh + total_contrib - total_expend
-    elif not df_contributions.empty and not df_expenditures.empty and amount_col_contrib and amount_col_expend:
-        cash_contributions = filter_cash_contributions(df_contributions)
-        total_contrib = cash_contributions[amount_col_contrib].sum() if not cash_contributions.empty else 0
-        total_expend = df_expenditures[amount_col_expend].sum()
-        ending_coh = starting_coh + total_contrib - total_expend
+    # One COH computation serves the metrics header and the Analysis tab table
+    coh_period = st.session_state.get('coh_period', "Year")
+    if summary_mode:
+        starting_coh, ending_coh, df_coh = summary['starting_coh'], summary['ending_coh'], summary['df_coh']
+    else:
+        # After a failed load, don't retry the fetch just for the index
+        cash_index = CashBalanceIndex(RunningTotal(), RunningTotal())
+        if committee_data_loaded:
+            cash_index = load_cash_index(
+                st.session_state.selected_committee,
+                dataset_versions["smfg-ds7h"],
+                dataset_versions["3adi-mht4"]
+            )
+        starting_coh, ending_coh, df_coh = compute_cash_on_hand(
+            cash_index,
+            year=st.session_state.filter_year,
+            date_start=st.session_state.filter_date_start,
+            date_end=st.session_state.filter_date_end,
+            period=coh_period
+        )
     
     cash_on_hand = ending_coh
     
@@ -1639,197 +1961,33 @@ elif st.session_state.selected_committee:
     with tab1:
         st.markdown("### Cash On Hand")
         
-        # Calculate starting COH
-        # If filters are applied, calculate COH from data before the filter
-        # Otherwise, starting COH is 0
-        starting_coh = 0
-        
-        has_filters = (st.session_state.filter_year is not None or 
-                      st.session_state.filter_date_start is not None or 
-                      st.session_state.filter_date_end is not None)
-        
-        # Find transaction type column for contributions
-        trans_type_col = None
-        for col in ['transaction_type', 'trans_type', 'type', 'contribution_type', 'transaction_cd', 'trans_cd']:
-            if col in df_contributions.columns:
-                trans_type_col = col
-                break
-        
-        # Filter contributions to only include "CON" (cash contributions) for COH
-        def filter_cash_contributions(df):
-            if df.empty or trans_type_col is None:
-                return df
-            # Filter to only include rows where transaction type is "CON"
-            filtered = df[df[trans_type_col].astype(str).str.upper().str.strip() == 'CON'].copy()
-            return filtered
-        
-        if has_filters and not df_contributions.empty and not df_expenditures.empty:
-            # Calculate COH from pre-filter data
-            # Get contributions and expenditures before the filter date/year
-            pre_filter_contrib = df_contributions.copy()
-            pre_filter_expend = df_expenditures.copy()
-            
-            # Filter to only cash contributions
-            pre_filter_contrib = filter_cash_contributions(pre_filter_contrib)
-            
-            # Apply pre-filter logic (before the selected year/date)
-            if st.session_state.filter_year and date_col_contrib:
-                pre_filter_contrib = pre_filter_contrib[
-                    pre_filter_contrib[date_col_contrib].dt.year < int(st.session_state.filter_year)
-                ]
-            if st.session_state.filter_year and date_col_expend:
-                pre_filter_expend = pre_filter_expend[
-                    pre_filter_expend[date_col_expend].dt.year < int(st.session_state.filter_year)
-                ]
-            
-            if st.session_state.filter_date_start and date_col_contrib:
-                pre_filter_contrib = pre_filter_contrib[
-                    pre_filter_contrib[date_col_contrib] < pd.Timestamp(st.session_state.filter_date_start)
-                ]
-            if st.session_state.filter_date_start and date_col_expend:
-                pre_filter_expend = pre_filter_expend[
-                    pre_filter_expend[date_col_expend] < pd.Timestamp(st.session_state.filter_date_start)
-                ]
-            
-            # Calculate starting COH from pre-filter data
-            if amount_col_contrib and not pre_filter_contrib.empty:
-                pre_contrib_total = pre_filter_contrib[amount_col_contrib].sum()
-            else:
-                pre_contrib_total = 0
-            
-            if amount_col_expend and not pre_filter_expend.empty:
-                pre_expend_total = pre_filter_expend[amount_col_expend].sum()
-            else:
-                pre_expend_total = 0
-            
-            starting_coh = pre_contrib_total - pre_expend_total
-        
-        # Calculate ending COH (from filtered data if filters are applied, otherwise all data)
-        ending_coh = starting_coh
-        if has_filters:
-            # Use filtered data for ending COH calculation
-            cash_contributions_filtered = filter_cash_contributions(df_contributions_filtered)
-            total_contrib = cash_contributions_filtered[amount_col_contrib].sum() if amount_col_contrib and not cash_contributions_filtered.empty else 0
-            total_expend = df_expenditures_filtered[amount_col_expend].sum() if amount_col_expend and not df_expenditures_filtered.empty else 0
-            ending_coh = starting_coh + total_contrib - total_expend
-        elif not df_contributions.empty and not df_expenditures.empty and amount_col_contrib and amount_col_expend:
-            # No filters - use all data
-            cash_contributions = filter_cash_contributions(df_contributions)
-            total_contrib = cash_contributions[amount_col_contrib].sum() if not cash_contributions.empty else 0
-            total_expend = df_expenditures[amount_col_expend].sum()
-            ending_coh = starting_coh + total_contrib - total_expend
-        
         # Display subtitle with Starting and Ending COH (using HTML to avoid green text)
         st.markdown(f'<p style="font-size: 1rem; color: #333;"><strong>Starting COH:</strong> ${starting_coh:,.2f}  |  <strong>Ending COH:</strong> ${ending_coh:,.2f}</p>', unsafe_allow_html=True)
         
-        st.markdown("#### Cash on Hand by Year")
-        # Calculate COH by Year
-        if not df_contributions.empty and not df_expenditures.empty and amount_col_contrib and amount_col_expend:
-            # Get years from filtered data if filters are applied, otherwise all data
-            all_years = set()
-            
-            if has_filters:
-                # Use filtered data to get years
-                if date_col_contrib and not df_contributions_filtered.empty:
-                    contrib_years = df_contributions_filtered[date_col_contrib].dropna().dt.year.unique()
-                    all_years.update(contrib_years)
-                
-                if date_col_expend and not df_expenditures_filtered.empty:
-                    expend_years = df_expenditures_filtered[date_col_expend].dropna().dt.year.unique()
-                    all_years.update(expend_years)
-            else:
-                # No filters - use all data
-                if date_col_contrib:
-                    contrib_years = df_contributions[date_col_contrib].dropna().dt.year.unique()
-                    all_years.update(contrib_years)
-                
-                if date_col_expend:
-                    expend_years = df_expenditures[date_col_expend].dropna().dt.year.unique()
-                    all_years.update(expend_years)
-            
-            if all_years:
-                # Sort years
-                sorted_years = sorted(all_years)
-                
-                # Calculate COH for each year
-                coh_data = []
-                running_coh = starting_coh
-                
-                for year in sorted_years:
-                    # Get contributions for this year (only cash contributions "CON")
-                    # Use filtered data if filters are applied
-                    if has_filters:
-                        if date_col_contrib and not df_contributions_filtered.empty:
-                            year_contrib = df_contributions_filtered[
-                                df_contributions_filtered[date_col_contrib].dt.year == year
-                            ]
-                        else:
-                            year_contrib = pd.DataFrame()
-                        
-                        if date_col_expend and not df_expenditures_filtered.empty:
-                            year_expend = df_expenditures_filtered[
-                                df_expenditures_filtered[date_col_expend].dt.year == year
-                            ]
-                        else:
-                            year_expend = pd.DataFrame()
-                    else:
-                        if date_col_contrib:
-                            year_contrib = df_contributions[
-                                df_contributions[date_col_contrib].dt.year == year
-                            ]
-                        else:
-                            year_contrib = pd.DataFrame()
-                        
-                        if date_col_expend:
-                            year_expend = df_expenditures[
-                                df_expenditures[date_col_expend].dt.year == year
-                            ]
-                        else:
-                            year_expend = pd.DataFrame()
-                    
-                    # Filter to only cash contributions for COH
-                    year_contrib = filter_cash_contributions(year_contrib)
-                    
-                    year_contrib_total = year_contrib[amount_col_contrib].sum() if amount_col_contrib and not year_contrib.empty else 0
-                    year_expend_total = year_expend[amount_col_expend].sum() if amount_col_expend and not year_expend.empty else 0
-                    
-                    # Calculate COH for this year
-                    year_net = year_contrib_total - year_expend_total
-                    running_coh += year_net
-                    
-                    coh_data.append({
-                        'Year': int(year),
-                        'Contributions': year_contrib_total,
-                        'Expenditures': year_expend_total,
-                        'Net': year_net,
-                        'Ending COH': running_coh
-                    })
-                
-                # Create DataFrame and display
-                if coh_data:
-                    df_coh = pd.DataFrame(coh_data)
-                    # Store in session state for PDF generation
-                    st.session_state.coh_data_for_pdf = df_coh.copy()
-                    
-                    # Format the display
-                    df_display = df_coh.copy()
-                    df_display['Contributions'] = df_display['Contributions'].apply(lambda x: f"${x:,.2f}")
-                    df_display['Expenditures'] = df_display['Expenditures'].apply(lambda x: f"${x:,.2f}")
-                    df_display['Net'] = df_display['Net'].apply(lambda x: f"${x:,.2f}")
-                    df_display['Ending COH'] = df_display['Ending COH'].apply(lambda x: f"${x:,.2f}")
-                    
-                    st.dataframe(df_display, width='stretch', hide_index=True)
-                else:
-                    st.info("No data available for COH calculation by year.")
-            else:
-                st.info("No date information available to calculate COH by year.")
+        if summary_mode:
+            # Server-side aggregates are per year
+            st.markdown("#### Cash on Hand by Year")
         else:
+            st.markdown(f"#### Cash on Hand by {coh_period}")
+            st.radio("Group by", list(COH_PERIODS), key='coh_period', horizontal=True, label_visibility="collapsed")
+        if df_coh is None:
             st.warning("Insufficient data available for Cash on Hand analysis.")
+        elif not df_coh.empty:
+            # Store in session state for PDF generation
+            st.session_state.coh_data_for_pdf = df_coh.copy()
+            
+            # Format the display
+            df_display = df_coh.copy()
+            for col in ['Contributions', 'Expenditures', 'Net', 'Ending COH']:
+                df_display[col] = df_display[col].apply(lambda x: f"${x:,.2f}")
+            st.dataframe(df_display, width='stretch', hide_index=True)
+        else:
+            st.info("No date information available to calculate COH by period.")
         
         # Visualizations Section
         st.markdown("---")
         
-        if not df_contributions_filtered.empty and amount_col_contrib:
+        if (summary_mode and contribution_count) or (not df_contributions_filtered.empty and amount_col_contrib):
             # Find state column
             state_col = None
             for col in ['state', 'contributor_state', 'state_cd', 'state_code']:
@@ -1837,82 +1995,120 @@ elif st.session_state.selected_committee:
                     state_col = col
                     break
             
+            # Chart data - from Socrata aggregates in summary mode, otherwise from the rows
+            if summary_mode:
+                state_donor_counts = summary['state_donor_counts']
+                state_totals = summary['state_totals']
+                top_donors = summary['top_donors']
+                monthly_totals = summary['monthly_totals']
+                top_recipients = summary['top_recipients']
+            else:
+                state_donor_counts = pd.Series(dtype=float)
+                state_totals = pd.Series(dtype=float)
+                if state_col and df_contributions_filtered[state_col].notna().any():
+                    # Top 5 States by Number of Donors
+                    if 'contributor_final' in df_contributions_filtered.columns:
+                        state_donor_counts = df_contributions_filtered.groupby(state_col, observed=True)['contributor_final'].nunique().sort_values(ascending=False).head(5)
+                    else:
+                        state_donor_counts = df_contributions_filtered[state_col].value_counts().loc[lambda counts: counts > 0].head(5)
+                    # Top 5 States by Sum of Donations
+                    state_totals = df_contributions_filtered.groupby(state_col, observed=True)[amount_col_contrib].sum().sort_values(ascending=False).head(5)
+                
+                # Top 5 Donors, labelled with their state when known
+                top_donors = pd.Series(dtype=float)
+                if 'contributor_final' in df_contributions_filtered.columns and state_col:
+                    donor_totals = df_contributions_filtered.groupby(['contributor_final', state_col], observed=True)[amount_col_contrib].sum().reset_index()
+                    donor_totals = donor_totals.sort_values(amount_col_contrib, ascending=False).head(5)
+                    if not donor_totals.empty:
+                        donor_totals['Donor'] = donor_totals.apply(
+                            lambda row: f"{row['contributor_final']} ({row[state_col]})" if pd.notna(row[state_col]) else row['contributor_final'],
+                            axis=1
+                        )
+                        top_donors = donor_totals.set_index('Donor')[amount_col_contrib]
+                elif 'contributor_final' in df_contributions_filtered.columns:
+                    top_donors = df_contributions_filtered.groupby('contributor_final', observed=True)[amount_col_contrib].sum().sort_values(ascending=False).head(5)
+                
+                # Donations Over Time
+                monthly_totals = pd.Series(dtype=float)
+                if date_col_contrib and df_contributions_filtered[date_col_contrib].notna().any():
+                    year_month = df_contributions_filtered[date_col_contrib].dt.to_period('M').rename('year_month')
+                    monthly_totals = df_contributions_filtered.groupby(year_month)[amount_col_contrib].sum()
+                    monthly_totals.index = monthly_totals.index.astype(str)
+                
+                # Top 5 Expenditure Recipients
+                top_recipients = None
+                if not df_expenditures_filtered.empty and amount_col_expend and 'recipient_final' in df_expenditures_filtered.columns:
+                    # recipient_final is resolved once per load by process_expenditures
+                    top_recipients = df_expenditures_filtered.groupby('recipient_final', observed=True)[amount_col_expend].sum().sort_values(ascending=False).head(5)
+            
             # Row 1: Two charts side by side
             row1_col1, row1_col2 = st.columns(2)
             
             with row1_col1:
                 st.markdown("#### Top 5 States by Number of Donors")
                 # Top 5 States by Number of Donors
-                if state_col and df_contributions_filtered[state_col].notna().any():
-                    if 'contributor_final' in df_contributions_filtered.columns:
-                        state_donor_counts = df_contributions_filtered.groupby(state_col)['contributor_final'].nunique().sort_values(ascending=False).head(5)
-                    else:
-                        state_donor_counts = df_contributions_filtered[df_contributions_filtered[state_col].notna()][state_col].value_counts().head(5)
-                    
-                    if not state_donor_counts.empty:
-                        total_donors = state_donor_counts.sum()
-                        fig_states_count = px.bar(
-                            x=state_donor_counts.values,
-                            y=state_donor_counts.index,
-                            orientation='h',
-                            labels={'x': 'Number of Donors', 'y': 'State'},
-                            title="Top 5 States by Number of Donors",
-                            color_discrete_sequence=[THEME_PRIMARY_COLOR]
-                        )
-                        annotations = []
-                        for state, count in state_donor_counts.items():
-                            pct = (count / total_donors * 100) if total_donors > 0 else 0
-                            annotations.append(dict(
-                                x=count,
-                                y=state,
-                                text=f"<b>{count} ({pct:.1f}%)</b>",
-                                showarrow=False,
-                                xanchor='left',
-                                xshift=5,
-                                font=dict(color='black', size=12)
-                            ))
-                        fig_states_count.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            annotations=annotations,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_states_count, use_container_width=True, config={'displayModeBar': False})
+                if not state_donor_counts.empty:
+                    total_donors = state_donor_counts.sum()
+                    fig_states_count = px.bar(
+                        x=state_donor_counts.values,
+                        y=state_donor_counts.index,
+                        orientation='h',
+                        labels={'x': 'Number of Donors', 'y': 'State'},
+                        title="Top 5 States by Number of Donors",
+                        color_discrete_sequence=[THEME_PRIMARY_COLOR]
+                    )
+                    annotations = []
+                    for state, count in state_donor_counts.items():
+                        pct = (count / total_donors * 100) if total_donors > 0 else 0
+                        annotations.append(dict(
+                            x=count,
+                            y=state,
+                            text=f"<b>{count} ({pct:.1f}%)</b>",
+                            showarrow=False,
+                            xanchor='left',
+                            xshift=5,
+                            font=dict(color='black', size=12)
+                        ))
+                    fig_states_count.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        annotations=annotations,
+                        plot_bgcolor='white',
+                        paper_bgcolor='white'
+                    )
+                    st.plotly_chart(fig_states_count, use_container_width=True, config={'displayModeBar': False})
             
             with row1_col2:
                 st.markdown("#### Top 5 States by Sum of Donations")
                 # Top 5 States by Sum of Donations
-                if state_col and df_contributions_filtered[state_col].notna().any():
-                    state_totals = df_contributions_filtered.groupby(state_col)[amount_col_contrib].sum().sort_values(ascending=False).head(5)
-                    if not state_totals.empty:
-                        total_amount = state_totals.sum()
-                        fig_states_sum = px.bar(
-                            x=state_totals.values,
-                            y=state_totals.index,
-                            orientation='h',
-                            labels={'x': 'Total Donations ($)', 'y': 'State'},
-                            title="Top 5 States by Sum of Donations",
-                            color_discrete_sequence=[THEME_PRIMARY_COLOR]
-                        )
-                        annotations = []
-                        for state, amount in state_totals.items():
-                            pct = (amount / total_amount * 100) if total_amount > 0 else 0
-                            annotations.append(dict(
-                                x=amount,
-                                y=state,
-                                text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
-                                showarrow=False,
-                                xanchor='left',
-                                xshift=5,
-                                font=dict(color='black', size=12)
-                            ))
-                        fig_states_sum.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            annotations=annotations,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_states_sum, use_container_width=True, config={'displayModeBar': False})
+                if not state_totals.empty:
+                    total_amount = state_totals.sum()
+                    fig_states_sum = px.bar(
+                        x=state_totals.values,
+                        y=state_totals.index,
+                        orientation='h',
+                        labels={'x': 'Total Donations ($)', 'y': 'State'},
+                        title="Top 5 States by Sum of Donations",
+                        color_discrete_sequence=[THEME_PRIMARY_COLOR]
+                    )
+                    annotations = []
+                    for state, amount in state_totals.items():
+                        pct = (amount / total_amount * 100) if total_amount > 0 else 0
+                        annotations.append(dict(
+                            x=amount,
+                            y=state,
+                            text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
+                            showarrow=False,
+                            xanchor='left',
+                            xshift=5,
+                            font=dict(color='black', size=12)
+                        ))
+                    fig_states_sum.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        annotations=annotations,
+                        plot_bgcolor='white',
+                        paper_bgcolor='white'
+                    )
+                    st.plotly_chart(fig_states_sum, use_container_width=True, config={'displayModeBar': False})
             
             # Row 2: Two charts side by side
             row2_col1, row2_col2 = st.columns(2)
@@ -1920,162 +2116,114 @@ elif st.session_state.selected_committee:
             with row2_col1:
                 st.markdown("#### Top 5 Donors by Sum of Donations")
                 # Top 5 Donors
-                if 'contributor_final' in df_contributions_filtered.columns and state_col:
-                    top_donors = df_contributions_filtered.groupby(['contributor_final', state_col])[amount_col_contrib].sum().reset_index()
-                    top_donors = top_donors.sort_values(amount_col_contrib, ascending=False).head(5)
-                    if not top_donors.empty:
-                        top_donors['Donor'] = top_donors.apply(
-                            lambda row: f"{row['contributor_final']} ({row[state_col]})" if pd.notna(row[state_col]) else row['contributor_final'],
-                            axis=1
-                        )
-                        total_donor_amount = top_donors[amount_col_contrib].sum()
-                        fig_donors = px.bar(
-                            x=top_donors[amount_col_contrib].values,
-                            y=top_donors['Donor'].values,
-                            orientation='h',
-                            labels={'x': 'Total Donations ($)', 'y': 'Donor'},
-                            title="Top 5 Donors by Sum of Donations",
-                            color_discrete_sequence=[THEME_PRIMARY_COLOR]
-                        )
-                        annotations = []
-                        for _, row in top_donors.iterrows():
-                            amount = row[amount_col_contrib]
-                            pct = (amount / total_donor_amount * 100) if total_donor_amount > 0 else 0
-                            annotations.append(dict(
-                                x=amount,
-                                y=row['Donor'],
-                                text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
-                                showarrow=False,
-                                xanchor='left',
-                                xshift=5,
-                                font=dict(color='black', size=11)
-                            ))
-                        fig_donors.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            annotations=annotations,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_donors, use_container_width=True, config={'displayModeBar': False})
-                elif 'contributor_final' in df_contributions_filtered.columns:
-                    top_donors = df_contributions_filtered.groupby('contributor_final')[amount_col_contrib].sum().sort_values(ascending=False).head(5)
-                    if not top_donors.empty:
-                        total_donor_amount = top_donors.sum()
-                        fig_donors = px.bar(
-                            x=top_donors.values,
-                            y=top_donors.index,
-                            orientation='h',
-                            labels={'x': 'Total Donations ($)', 'y': 'Donor'},
-                            title="Top 5 Donors by Sum of Donations",
-                            color_discrete_sequence=[THEME_PRIMARY_COLOR]
-                        )
-                        annotations = []
-                        for donor, amount in top_donors.items():
-                            pct = (amount / total_donor_amount * 100) if total_donor_amount > 0 else 0
-                            annotations.append(dict(
-                                x=amount,
-                                y=donor,
-                                text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
-                                showarrow=False,
-                                xanchor='left',
-                                xshift=5,
-                                font=dict(color='black', size=11)
-                            ))
-                        fig_donors.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            annotations=annotations,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_donors, use_container_width=True, config={'displayModeBar': False})
+                if not top_donors.empty:
+                    total_donor_amount = top_donors.sum()
+                    fig_donors = px.bar(
+                        x=top_donors.values,
+                        y=top_donors.index,
+                        orientation='h',
+                        labels={'x': 'Total Donations ($)', 'y': 'Donor'},
+                        title="Top 5 Donors by Sum of Donations",
+                        color_discrete_sequence=[THEME_PRIMARY_COLOR]
+                    )
+                    annotations = []
+                    for donor, amount in top_donors.items():
+                        pct = (amount / total_donor_amount * 100) if total_donor_amount > 0 else 0
+                        annotations.append(dict(
+                            x=amount,
+                            y=donor,
+                            text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
+                            showarrow=False,
+                            xanchor='left',
+                            xshift=5,
+                            font=dict(color='black', size=11)
+                        ))
+                    fig_donors.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        annotations=annotations,
+                        plot_bgcolor='white',
+                        paper_bgcolor='white'
+                    )
+                    st.plotly_chart(fig_donors, use_container_width=True, config={'displayModeBar': False})
             
             with row2_col2:
                 st.markdown("#### Donations Over Time (Monthly)")
                 # Donations Over Time
-                if date_col_contrib and df_contributions_filtered[date_col_contrib].notna().any():
-                    df_contributions_filtered['year_month'] = df_contributions_filtered[date_col_contrib].dt.to_period('M')
-                    monthly_totals = df_contributions_filtered.groupby('year_month')[amount_col_contrib].sum()
-                    if not monthly_totals.empty:
-                        monthly_totals.index = monthly_totals.index.astype(str)
-                        fig_timeline = px.line(
-                            x=monthly_totals.index,
-                            y=monthly_totals.values,
-                            labels={'x': 'Month', 'y': 'Total Donations ($)'},
-                            title="Donations Over Time (Monthly)"
-                        )
-                        fig_timeline.update_traces(mode='lines+markers', line=dict(width=3, color=THEME_PRIMARY_COLOR))
-                        fig_timeline.update_layout(
-                            hovermode='x unified',
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_timeline, use_container_width=True, config={'displayModeBar': False})
+                if not monthly_totals.empty:
+                    fig_timeline = px.line(
+                        x=monthly_totals.index,
+                        y=monthly_totals.values,
+                        labels={'x': 'Month', 'y': 'Total Donations ($)'},
+                        title="Donations Over Time (Monthly)"
+                    )
+                    fig_timeline.update_traces(mode='lines+markers', line=dict(width=3, color=THEME_PRIMARY_COLOR))
+                    fig_timeline.update_layout(
+                        hovermode='x unified',
+                        plot_bgcolor='white',
+                        paper_bgcolor='white'
+                    )
+                    st.plotly_chart(fig_timeline, use_container_width=True, config={'displayModeBar': False})
             
             # Row 3: Top 5 Expenditure Recipients
             st.markdown("---")
             st.markdown("#### Top 5 Expenditure Recipients")
-            if not df_expenditures_filtered.empty and amount_col_expend:
-                # Create recipient name column (organization_nm or first_nm + last_nm + state)
-                if 'organization_nm' in df_expenditures_filtered.columns:
-                    df_expenditures_filtered['recipient_final'] = df_expenditures_filtered.apply(
-                        lambda row: row['organization_nm'] if pd.notna(row['organization_nm']) and str(row['organization_nm']).strip() != '' 
-                        else f"{row.get('first_nm', '')} {row.get('last_nm', '')}".strip() + (f" ({row.get('state', '')})" if pd.notna(row.get('state')) and str(row.get('state')).strip() else ""),
-                        axis=1
+            if top_recipients is not None:
+                if not top_recipients.empty:
+                    total_recipient_amount = top_recipients.sum()
+                    fig_recipients = px.bar(
+                        x=top_recipients.values,
+                        y=top_recipients.index,
+                        orientation='h',
+                        labels={'x': 'Total Expenditures ($)', 'y': 'Recipient'},
+                        title="Top 5 Expenditure Recipients",
+                        color_discrete_sequence=[THEME_PRIMARY_COLOR]
                     )
-                elif 'first_nm' in df_expenditures_filtered.columns and 'last_nm' in df_expenditures_filtered.columns:
-                    df_expenditures_filtered['recipient_final'] = df_expenditures_filtered.apply(
-                        lambda row: f"{row.get('first_nm', '')} {row.get('last_nm', '')}".strip() + (f" ({row.get('state', '')})" if pd.notna(row.get('state')) and str(row.get('state')).strip() else ""),
-                        axis=1
+                    annotations = []
+                    for recipient, amount in top_recipients.items():
+                        pct = (amount / total_recipient_amount * 100) if total_recipient_amount > 0 else 0
+                        annotations.append(dict(
+                            x=amount,
+                            y=recipient,
+                            text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
+                            showarrow=False,
+                            xanchor='left',
+                            xshift=5,
+                            font=dict(color='black', size=11)
+                        ))
+                    fig_recipients.update_layout(
+                        yaxis={'categoryorder': 'total ascending'},
+                        annotations=annotations,
+                        plot_bgcolor='white',
+                        paper_bgcolor='white'
                     )
-                else:
-                    # Fallback to finding recipient column
-                    recipient_col = None
-                    for col in ['recipient', 'recipient_nm', 'payee', 'payee_nm', 'vendor', 'vendor_nm', 'expenditure_recipient']:
-                        if col in df_expenditures_filtered.columns:
-                            recipient_col = col
-                            break
-                    if recipient_col:
-                        df_expenditures_filtered['recipient_final'] = df_expenditures_filtered[recipient_col]
-                    else:
-                        df_expenditures_filtered['recipient_final'] = 'Unknown'
-                
-                if 'recipient_final' in df_expenditures_filtered.columns:
-                    top_recipients = df_expenditures_filtered.groupby('recipient_final')[amount_col_expend].sum().sort_values(ascending=False).head(5)
-                    if not top_recipients.empty:
-                        total_recipient_amount = top_recipients.sum()
-                        fig_recipients = px.bar(
-                            x=top_recipients.values,
-                            y=top_recipients.index,
-                            orientation='h',
-                            labels={'x': 'Total Expenditures ($)', 'y': 'Recipient'},
-                            title="Top 5 Expenditure Recipients",
-                            color_discrete_sequence=[THEME_PRIMARY_COLOR]
-                        )
-                        annotations = []
-                        for recipient, amount in top_recipients.items():
-                            pct = (amount / total_recipient_amount * 100) if total_recipient_amount > 0 else 0
-                            annotations.append(dict(
-                                x=amount,
-                                y=recipient,
-                                text=f"<b>${amount:,.0f} ({pct:.1f}%)</b>",
-                                showarrow=False,
-                                xanchor='left',
-                                xshift=5,
-                                font=dict(color='black', size=11)
-                            ))
-                        fig_recipients.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            annotations=annotations,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white'
-                        )
-                        st.plotly_chart(fig_recipients, use_container_width=True, config={'displayModeBar': False})
-                else:
-                    st.info("Unable to determine recipient names from expenditure data.")
+                    st.plotly_chart(fig_recipients, use_container_width=True, config={'displayModeBar': False})
             else:
                 st.warning("No expenditure data available for visualization.")
         else:
             st.warning("No contribution data available for visualizations.")
+        
+        # Name search over the loaded transactions, within the year and date filters
+        if not summary_mode and committee_data_loaded:
+            st.markdown("---")
+            st.markdown("#### Search Transactions by Name")
+            transaction_name_search = st.text_input(
+                "Search transactions by name",
+                placeholder="Contributor or payee name",
+                key=f"transaction_name_search_{st.session_state.selected_committee}",
+                label_visibility="collapsed"
+            ).strip()
+            if transaction_name_search:
+                contributor_names_index, payee_names_index = load_transaction_names(
+                    st.session_state.selected_committee,
+                    dataset_versions["smfg-ds7h"],
+                    dataset_versions["3adi-mht4"]
+                )
+                for label, names, df in [("Contributions", contributor_names_index, df_contributions_filtered),
+                                         ("Expenditures", payee_names_index, df_expenditures_filtered)]:
+                    matches = find_transactions(names, df, transaction_name_search)
+                    st.markdown(f"**{label}:** {len(matches):,} matching")
+                    if not matches.empty:
+                        st.dataframe(matches.head(RESULTS_PAGE_SIZE), width='stretch', hide_index=True)
     
     with tab2:
         # PDF Export Section - Direct download button
@@ -2084,7 +2232,7 @@ elif st.session_state.selected_committee:
             coh_data_for_pdf = st.session_state.get('coh_data_for_pdf', None)
             pdf_buffer = generate_pdf_report(
                 name, committee_info, total_raised, total_spent, cash_on_hand,
-                latest_data_date_unfiltered, df_contributions_filtered, df_expenditures_filtered,
+                latest_data_date_unfiltered, contribution_count, expenditure_count,
                 coh_data_for_pdf, starting_coh, ending_coh, amount_col_contrib, amount_col_expend,
                 candidate_name=name, earliest_date=earliest_date, latest_date=latest_date
             )
@@ -2108,17 +2256,37 @@ elif st.session_state.selected_committee:
         with col_contrib2:
             st.write("")
         
-        if not df_contributions_filtered.empty:
-            st.markdown(f"**Total Records:** {len(df_contributions_filtered)}")
-            st.dataframe(df_contributions_filtered.head(10), width='stretch', height=300)
-            csv_contrib = df_contributions_filtered.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Contributions as CSV",
-                data=csv_contrib,
-                file_name=f"{st.session_state.selected_committee}_contributions_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                key="download_contributions"
-            )
+        if contribution_count:
+            st.markdown(f"**Total Records:** {contribution_count}")
+            if not summary_mode:
+                st.dataframe(df_contributions_filtered.head(10), width='stretch', height=300)
+            # The page only loads the columns it analyzes, so the full-width rows are
+            # fetched only once the user asks for the CSV
+            if st.button("Prepare Contributions CSV", key="prepare_contributions_export"):
+                st.session_state.export_contributions_for = st.session_state.selected_committee
+            if st.session_state.get('export_contributions_for') == st.session_state.selected_committee:
+                df_contrib_export = None
+                with st.spinner("Loading all contribution columns..."):
+                    try:
+                        df_contrib_export = load_committee_export(
+                            st.session_state.selected_committee, "smfg-ds7h", dataset_versions["smfg-ds7h"]
+                        )
+                    except Exception as e:
+                        st.error(f"Error loading export data: {str(e)}")
+                if df_contrib_export is not None:
+                    # Sliced on the column load_committee_export sorted it by
+                    df_contrib_export = filter_by_period(
+                        df_contrib_export, find_column(df_contrib_export, CONTRIBUTION_DATE_COLUMNS), st.session_state.filter_year,
+                        st.session_state.filter_date_start, st.session_state.filter_date_end
+                    )
+                    csv_contrib = df_contrib_export.to_csv(index=False)
+                    st.download_button(
+                        label="📥 Download Contributions as CSV",
+                        data=csv_contrib,
+                        file_name=f"{st.session_state.selected_committee}_contributions_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        key="download_contributions"
+                    )
         else:
             st.warning("No contribution data available for export.")
         
@@ -2131,17 +2299,35 @@ elif st.session_state.selected_committee:
         with col_expend2:
             st.write("")
         
-        if not df_expenditures_filtered.empty:
-            st.markdown(f"**Total Records:** {len(df_expenditures_filtered)}")
-            st.dataframe(df_expenditures_filtered.head(10), width='stretch', height=300)
-            csv_expend = df_expenditures_filtered.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Expenditures as CSV",
-                data=csv_expend,
-                file_name=f"{st.session_state.selected_committee}_expenditures_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                key="download_expenditures"
-            )
+        if expenditure_count:
+            st.markdown(f"**Total Records:** {expenditure_count}")
+            if not summary_mode:
+                st.dataframe(df_expenditures_filtered.head(10), width='stretch', height=300)
+            if st.button("Prepare Expenditures CSV", key="prepare_expenditures_export"):
+                st.session_state.export_expenditures_for = st.session_state.selected_committee
+            if st.session_state.get('export_expenditures_for') == st.session_state.selected_committee:
+                df_expend_export = None
+                with st.spinner("Loading all expenditure columns..."):
+                    try:
+                        df_expend_export = load_committee_export(
+                            st.session_state.selected_committee, "3adi-mht4", dataset_versions["3adi-mht4"]
+                        )
+                    except Exception as e:
+                        st.error(f"Error loading export data: {str(e)}")
+                if df_expend_export is not None:
+                    # Sliced on the column load_committee_export sorted it by
+                    df_expend_export = filter_by_period(
+                        df_expend_export, find_column(df_expend_export, EXPENDITURE_DATE_COLUMNS), st.session_state.filter_year,
+                        st.session_state.filter_date_start, st.session_state.filter_date_end
+                    )
+                    csv_expend = df_expend_export.to_csv(index=False)
+                    st.download_button(
+                        label="📥 Download Expenditures as CSV",
+                        data=csv_expend,
+                        file_name=f"{st.session_state.selected_committee}_expenditures_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        key="download_expenditures"
+                    )
         else:
             st.warning("No expenditure data available for export.")
     
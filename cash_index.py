@@ -0,0 +1,100 @@
+"""Prefix-sum index over a committee's cash flows.
+
+Built once per committee load and cached next to the committee frames. Each side
+(cash contributions, expenditures) keeps its dated amounts sorted by date with a
+running total, so the sum over any date range is two searchsorted lookups and
+Cash on Hand for a new year or date filter never rescans the frames.
+"""
+import numpy as np
+import pandas as pd
+
+class RunningTotal:
+    """Amounts of one side sorted by date, with their cumulative sum."""
+
+    def __init__(self, dates=None, amounts=None):
+        self.has_amounts = amounts is not None
+        if dates is None or amounts is None:
+            self.dates = np.array([], dtype='datetime64[ns]')
+            self.sums = np.zeros(1)
+            self.undated = 0.0
+            return
+        values = np.nan_to_num(np.asarray(amounts, dtype=float))
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        dated = ~np.isnat(dates)
+        order = np.argsort(dates[dated], kind='stable')
+        self.dates = dates[dated][order]
+        # sums[i] is the total of the i earliest rows
+        self.sums = np.concatenate(([0.0], np.cumsum(values[dated][order])))
+        self.undated = float(values[~dated].sum())
+
+    def position(self, when):
+        """Number of rows dated before when (all rows when it is None)."""
+        if when is None:
+            return len(self.dates)
+        when = pd.Timestamp(when).to_datetime64().astype('datetime64[ns]')
+        return int(np.searchsorted(self.dates, when, side='left'))
+
+    def window(self, start=None, stop=None):
+        """Positions (lo, hi) of the rows dated in [start, stop); empty when the
+        bounds don't overlap."""
+        lo = self.position(start) if start is not None else 0
+        return lo, max(lo, self.position(stop))
+
+    def before(self, when):
+        """Total of the rows dated before when; 0 when it is None."""
+        if when is None:
+            return 0.0
+        return float(self.sums[self.position(when)])
+
+    def between(self, start=None, stop=None):
+        """Total of the rows dated in [start, stop). Undated rows only count when
+        neither bound is set."""
+        lo, hi = self.window(start, stop)
+        total = float(self.sums[hi] - self.sums[lo])
+        if start is None and stop is None:
+            total += self.undated
+        return total
+
+    def by_period(self, start=None, stop=None, freq="Y"):
+        """Totals of the dated rows in [start, stop) per period: a Series indexed
+        by year for "Y", otherwise by pandas Period of frequency freq ("Q" or "M")."""
+        lo, hi = self.window(start, stop)
+        dates = pd.DatetimeIndex(self.dates[lo:hi])
+        if not len(dates):
+            return pd.Series(dtype=float)
+        # Integer period numbers, so grouping never builds Period objects per row
+        if freq == "Y":
+            keys = dates.year
+        elif freq == "Q":
+            keys = dates.year * 4 + (dates.month - 1) // 3
+        else:
+            keys = dates.year * 12 + dates.month - 1
+        keys = np.asarray(keys)
+        # Rows are sorted, so each period is a contiguous run
+        firsts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.append(firsts[1:], hi - lo)
+        totals = self.sums[lo + ends] - self.sums[lo + firsts]
+        if freq == "Y":
+            index = pd.Index(keys[firsts])
+        else:
+            index = pd.DatetimeIndex(self.dates[lo + firsts]).to_period(freq)
+        return pd.Series(totals, index=index)
+
+class CashBalanceIndex:
+    """Running totals of a committee's cash contributions and expenditures."""
+
+    def __init__(self, contributions, expenditures):
+        self.contributions = contributions
+        self.expenditures = expenditures
+
+    @property
+    def has_amounts(self):
+        return self.contributions.has_amounts or self.expenditures.has_amounts
+
+    def balance_before(self, when):
+        """Cash on hand from everything dated before when."""
+        return self.contributions.before(when) - self.expenditures.before(when)
+
+    def net_between(self, start=None, stop=None):
+        """Cash contributions minus expenditures dated in [start, stop)."""
+        return self.contributions.between(start, stop) - self.expenditures.between(start, stop)
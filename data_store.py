@@ -0,0 +1,186 @@
+"""On-disk Parquet cache for the Iowa Open Data datasets.
+
+Layout under DATA_CACHE_DIR, one directory per Socrata dataset:
+
+    5dtu-swbk/all.parquet              committee list
+    smfg-ds7h/<committee key>.parquet  contributions, one file per committee
+    3adi-mht4/<committee key>.parquet  expenditures, one file per committee
+
+Partitioning by committee means the detail page reads only the rows it needs.
+Each partition has a small JSON sidecar recording the dataset version
+(rowsUpdatedAt) it was synced at, so it can be reused until the portal reports
+a change. The cache is best effort: read and write failures are treated as
+cache misses.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+DATA_CACHE_DIR = os.getenv(
+    "DATA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data_cache")
+)
+# Seconds a committee partition is served before it is fetched again, used when
+# the dataset version is unknown
+DATA_CACHE_MAX_AGE = int(os.getenv("DATA_CACHE_MAX_AGE", "3600"))
+# The committee list changes rarely, so it is kept for a day
+COMMITTEE_LIST_MAX_AGE = int(os.getenv("COMMITTEE_LIST_MAX_AGE", "86400"))
+# Seconds between full re-downloads of a committee's rows. Incremental syncs only
+# see added and updated rows, so this bounds how long an undetected upstream
+# deletion can linger
+FULL_SYNC_MAX_AGE = int(os.getenv("DATA_CACHE_FULL_SYNC_MAX_AGE", str(7 * 86400)))
+
+def committee_key(committee_name):
+    """File-system safe, collision free partition key for a committee name."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', committee_name).strip('-')[:60]
+    digest = hashlib.sha1(committee_name.encode('utf-8')).hexdigest()[:12]
+    return f"{slug}-{digest}" if slug else digest
+
+def partition_path(dataset_id, partition="all"):
+    """Path of the Parquet file holding one partition of a dataset."""
+    return os.path.join(DATA_CACHE_DIR, dataset_id, f"{partition}.parquet")
+
+def partition_meta_path(dataset_id, partition="all"):
+    """Path of the JSON sidecar holding a partition's sync metadata."""
+    return os.path.join(DATA_CACHE_DIR, dataset_id, f"{partition}.meta.json")
+
+def partition_meta(dataset_id, partition="all"):
+    """A partition's sync metadata, or {} if unknown."""
+    try:
+        with open(partition_meta_path(dataset_id, partition)) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def partition_version(dataset_id, partition="all"):
+    """Dataset version a partition was last synced at, or None if unknown."""
+    return partition_meta(dataset_id, partition).get('version')
+
+def write_partition_version(dataset_id, version, partition="all", full_sync=True):
+    """Record the dataset version a partition was synced at. full_sync=False marks
+    an incremental sync, which keeps the time of the last full download."""
+    path = partition_meta_path(dataset_id, partition)
+    now = time.time()
+    full_synced_at = now if full_sync else partition_meta(dataset_id, partition).get('full_synced_at')
+    try:
+        with open(path, 'w') as f:
+            json.dump({'version': version, 'synced_at': now, 'full_synced_at': full_synced_at}, f)
+    except Exception:
+        pass
+
+def is_full_sync_due(dataset_id, partition="all", max_age=FULL_SYNC_MAX_AGE):
+    """Whether a partition was last fully downloaded more than max_age seconds ago
+    (or never, as far as its metadata knows)."""
+    full_synced_at = partition_meta(dataset_id, partition).get('full_synced_at')
+    return full_synced_at is None or time.time() - full_synced_at > max_age
+
+def is_partition_fresh(dataset_id, version, partition="all", max_age=DATA_CACHE_MAX_AGE):
+    """Whether a cached partition can be served as is.
+    With a known dataset version the partition must have been synced at that
+    version; otherwise it must be younger than max_age seconds."""
+    if version is not None:
+        return str(partition_version(dataset_id, partition)) == str(version)
+    age = partition_age(dataset_id, partition)
+    return age is not None and age <= max_age
+
+def read_partition(dataset_id, partition="all", max_age=None):
+    """Read a cached partition.
+    Returns None if it is missing, older than max_age seconds, or unreadable."""
+    path = partition_path(dataset_id, partition)
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+def partition_age(dataset_id, partition="all"):
+    """Seconds since a partition was last written or refreshed, or None if missing."""
+    try:
+        return time.time() - os.path.getmtime(partition_path(dataset_id, partition))
+    except OSError:
+        return None
+
+def touch_partition(dataset_id, partition="all", version=None):
+    """Mark a partition as refreshed at version without rewriting it."""
+    try:
+        os.utime(partition_path(dataset_id, partition))
+    except OSError:
+        return
+    write_partition_version(dataset_id, version, partition, full_sync=False)
+
+def write_partition(dataset_id, df, partition="all", version=None, full_sync=True):
+    """Atomically replace a cached partition. Returns True if it was written.
+    full_sync=False when df came from merging an incremental sync."""
+    path = partition_path(dataset_id, partition)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        write_partition_version(dataset_id, version, partition, full_sync=full_sync)
+        return True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+def read_committee_partition(dataset_id, committee_name, max_age=DATA_CACHE_MAX_AGE):
+    """Read one committee's cached rows of a transaction dataset."""
+    return read_partition(dataset_id, committee_key(committee_name), max_age=max_age)
+
+def write_committee_partition(dataset_id, committee_name, df, version=None, full_sync=True):
+    """Cache one committee's rows of a transaction dataset."""
+    return write_partition(dataset_id, df, committee_key(committee_name), version=version,
+                           full_sync=full_sync)
+
+def is_committee_full_sync_due(dataset_id, committee_name):
+    """Whether one committee's cached rows are due for a full re-download."""
+    return is_full_sync_due(dataset_id, committee_key(committee_name))
+
+def is_committee_partition_fresh(dataset_id, committee_name, version):
+    """Whether one committee's cached rows can be served without a sync."""
+    return is_partition_fresh(dataset_id, version, committee_key(committee_name))
+
+def touch_committee_partition(dataset_id, committee_name, version=None):
+    """Mark one committee's cached rows as refreshed."""
+    touch_partition(dataset_id, committee_key(committee_name), version=version)
+
+_views_lock = threading.Lock()
+
+def views_path():
+    """Path of the JSON file counting detail page views per committee."""
+    return os.path.join(DATA_CACHE_DIR, "committee_views.json")
+
+def read_committee_views():
+    """Detail page views per committee name, or {} if none are recorded."""
+    try:
+        with open(views_path()) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def record_committee_view(committee_name):
+    """Count one detail page view of a committee (used to pick what to warm)."""
+    with _views_lock:
+        views = read_committee_views()
+        views[committee_name] = views.get(committee_name, 0) + 1
+        path = views_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(views, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+
+def most_viewed_committees(n):
+    """Names of the n most viewed committees, most viewed first."""
+    views = read_committee_views()
+    return sorted(views, key=views.get, reverse=True)[:n]
@@ -0,0 +1,372 @@
+"""Socrata download and sync logic shared by the app and the command-line tools.
+
+Nothing here uses Streamlit, so the same code runs inside a session, in the
+app's background cache warmer, and from the command line. Downloads are
+written through to the on-disk cache in data_store.
+
+SocrataBackend is the remote implementation of the query interface the app
+reads data through; local_engine.LocalBackend is the local one.
+"""
+import csv
+import io
+import os
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+import data_store
+
+# Socrata datasets: committee list, contributions, expenditures
+DATASET_IDS = ["5dtu-swbk", "smfg-ds7h", "3adi-mht4"]
+# On-disk cache entry of the committee activity table, built from both transaction datasets
+ACTIVITY_CACHE_ID = "committee_activity"
+SOCRATA_PAGE_SIZE = 50000  # Rows per $limit/$offset page for bulk fetches
+# Representation bulk downloads are requested in: "csv" is parsed straight into
+# typed columns by pyarrow, "json" builds object columns that are typed afterwards
+BULK_WIRE_FORMAT = os.getenv("SOCRATA_BULK_FORMAT", "csv")
+
+# Column projections - only these columns are requested for search and analysis.
+# Alternative names are listed because the app probes for them; any that don't
+# exist in a dataset are dropped from the $select. CSV exports fetch every column.
+COMMITTEE_COLUMNS = [
+    'committee_name', 'committee_nm', 'committee',
+    'committee_type', 'type', 'type_nm', 'committee_type_nm',
+    'election_year', 'election_yr', 'year', 'election_year_text',
+    'party', 'party_nm', 'party_name', 'political_party',
+    'office', 'office_sought', 'office_nm', 'office_name',
+    'district', 'district_nbr', 'district_number', 'district_num',
+    'candidate_name', 'candidate_nm', 'candidate', 'name'
+]
+CONTRIBUTION_COLUMNS = [
+    'committee_nm',
+    'date', 'contribution_date', 'transaction_date',
+    'amount', 'contribution_amount', 'transaction_amount',
+    'organization_nm', 'first_nm', 'last_nm', 'city',
+    'state', 'contributor_state', 'state_cd', 'state_code',
+    'transaction_type', 'trans_type', 'type', 'contribution_type', 'transaction_cd', 'trans_cd'
+]
+EXPENDITURE_COLUMNS = [
+    'committee_nm',
+    'date', 'expenditure_date', 'transaction_date',
+    'amount', 'expenditure_amount', 'transaction_amount',
+    'organization_nm', 'first_nm', 'last_nm', 'city', 'state',
+    'recipient', 'recipient_nm', 'payee', 'payee_nm', 'vendor', 'vendor_nm', 'expenditure_recipient'
+]
+
+# Per transaction dataset: projected columns, date columns and amount columns
+TRANSACTION_DATASETS = {
+    "smfg-ds7h": (CONTRIBUTION_COLUMNS,
+                  ['date', 'contribution_date', 'transaction_date'],
+                  ['amount', 'contribution_amount', 'transaction_amount']),
+    "3adi-mht4": (EXPENDITURE_COLUMNS,
+                  ['date', 'expenditure_date', 'transaction_date'],
+                  ['amount', 'expenditure_amount', 'transaction_amount'])
+}
+
+def projection_select(columns, available):
+    """Build a $select for the declared columns that exist in the dataset.
+    Falls back to every column when the dataset schema is unknown."""
+    if not available:
+        return "*"
+    selected = [col for col in columns if col in available]
+    return ", ".join(selected) if selected else "*"
+
+def type_page(df, date_columns, amount_columns):
+    """Convert date and amount columns of a freshly fetched page in place.
+    Columns that already have the right dtype are left alone."""
+    for col in date_columns:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in amount_columns:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def parse_csv_page(content, date_columns, amount_columns):
+    """Parse a CSV page with pyarrow, declaring every column's type up front:
+    dates as timestamps, amounts as floats and everything else as text (so codes
+    and districts keep their leading zeros). Empty fields become nulls, as
+    missing fields do in JSON."""
+    header = next(csv.reader([content.split(b'\n', 1)[0].decode('utf-8-sig')]), [])
+    column_types = {col: pa.string() for col in header}
+    for col in amount_columns:
+        if col in column_types:
+            column_types[col] = pa.float64()
+    for col in date_columns:
+        if col in column_types:
+            # System timestamps (:updated_at) are UTC; data dates have no zone
+            column_types[col] = pa.timestamp('ms', tz='UTC') if col.startswith(':') else pa.timestamp('ms')
+    try:
+        table = pa_csv.read_csv(io.BytesIO(content), convert_options=pa_csv.ConvertOptions(
+            column_types=column_types, strings_can_be_null=True
+        ))
+    except pa.ArrowInvalid:
+        # A value that doesn't parse: read dates and amounts as text and let
+        # type_page coerce them
+        table = pa_csv.read_csv(io.BytesIO(content), convert_options=pa_csv.ConvertOptions(
+            column_types={col: pa.string() for col in header}, strings_can_be_null=True
+        ))
+    return table.to_pandas(coerce_temporal_nanoseconds=True)
+
+def iter_dataset_pages(client, dataset_id, where=None, select="*", group=None, order=":id",
+                       date_columns=(), amount_columns=(), page_size=SOCRATA_PAGE_SIZE,
+                       wire_format="json", limit=None):
+    """Yield every row matching a query as typed DataFrame pages by walking
+    $offset/$limit pages. Pages are ordered by the :id system field (or the given
+    order for grouped queries) so paging is stable, and only one raw page is held
+    at a time. wire_format "csv" requests the CSV representation and parses it
+    into typed columns; "json" requests records and types them afterwards. limit
+    stops after that many rows."""
+    offset = 0
+    while True:
+        page_limit = page_size if limit is None else min(page_size, limit - offset)
+        soql = dict(where=where, select=select, group=group, order=order, limit=page_limit, offset=offset)
+        if wire_format == "csv":
+            page = client.get_csv(dataset_id, **soql)
+            df = parse_csv_page(page, date_columns, amount_columns)
+        else:
+            page = client.get(dataset_id, **soql)
+            df = pd.DataFrame.from_records(page)
+        del page
+        page_rows = len(df)
+        if page_rows:
+            # Catches values the CSV parser left as text; already typed columns are kept
+            yield type_page(df, date_columns, amount_columns)
+        if page_rows < page_limit or (limit is not None and offset + page_rows >= limit):
+            break
+        offset += page_size
+
+def fetch_dataset_pages(client, dataset_id, where=None, select="*", group=None, order=":id",
+                        date_columns=(), amount_columns=(),
+                        page_size=SOCRATA_PAGE_SIZE, on_progress=None, wire_format="json", limit=None):
+    """Fetch every row matching a query into one DataFrame (see iter_dataset_pages).
+    on_progress(rows_loaded) is called after every page."""
+    chunks = []
+    rows_loaded = 0
+    for chunk in iter_dataset_pages(client, dataset_id, where=where, select=select, group=group,
+                                    order=order, date_columns=date_columns,
+                                    amount_columns=amount_columns, page_size=page_size,
+                                    wire_format=wire_format, limit=limit):
+        chunks.append(chunk)
+        rows_loaded += len(chunk)
+        if on_progress:
+            on_progress(rows_loaded)
+
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+def merge_incremental(df_cached, df_delta):
+    """Merge newly fetched rows into a cached frame.
+    Rows are matched on the Socrata row id so updated rows replace their old copy."""
+    if df_delta.empty:
+        return df_cached
+    df = pd.concat([df_cached, df_delta], ignore_index=True)
+    if ':id' in df.columns:
+        df = df.drop_duplicates(subset=':id', keep='last').reset_index(drop=True)
+    return df
+
+def committee_row_count(client, dataset_id, where):
+    """Number of rows of a dataset matching where, counted by the server."""
+    results = client.get(dataset_id, select="count(*) AS row_count", where=where)
+    return int(results[0]['row_count']) if results else 0
+
+def build_committee_activity(backend):
+    """First and latest contribution and expenditure date of every committee, from
+    one grouped query per dataset. Indexed by committee name, with first_date and
+    latest_date over both datasets."""
+    columns = {}
+    for dataset_id, kind in [("smfg-ds7h", 'contribution'), ("3adi-mht4", 'expenditure')]:
+        df = backend.activity_dates(dataset_id)
+        if not df.empty and 'committee_nm' in df.columns:
+            df = df.dropna(subset=['committee_nm']).set_index('committee_nm')
+            columns[f'first_{kind}_date'] = df['first_date']
+            columns[f'latest_{kind}_date'] = df['latest_date']
+
+    df_activity = pd.DataFrame({
+        label: columns.get(label, pd.Series(dtype='datetime64[ns]'))
+        for label in ['first_contribution_date', 'latest_contribution_date',
+                      'first_expenditure_date', 'latest_expenditure_date']
+    })
+    df_activity['first_date'] = df_activity[['first_contribution_date', 'first_expenditure_date']].min(axis=1)
+    df_activity['latest_date'] = df_activity[['latest_contribution_date', 'latest_expenditure_date']].max(axis=1)
+    return df_activity.rename_axis('committee_nm')
+
+def sync_committee_activity(backend, contributions_version=None, expenditures_version=None):
+    """Committee activity table (see build_committee_activity), from the on-disk
+    cache when it was built from these dataset versions, otherwise rebuilt and
+    written back."""
+    version = None
+    if contributions_version is not None and expenditures_version is not None:
+        version = f"{contributions_version}/{expenditures_version}"
+    if data_store.is_partition_fresh(ACTIVITY_CACHE_ID, version):
+        df = data_store.read_partition(ACTIVITY_CACHE_ID)
+        if df is not None and 'committee_nm' in df.columns:
+            return df.set_index('committee_nm')
+
+    df_activity = build_committee_activity(backend)
+    data_store.write_partition(ACTIVITY_CACHE_ID, df_activity.reset_index(), version=version)
+    return df_activity
+
+def sync_committee_list(client, version=None, select="*"):
+    """Committee list, from the on-disk cache when it was synced at version,
+    otherwise downloaded and written back."""
+    if data_store.is_partition_fresh("5dtu-swbk", version, max_age=data_store.COMMITTEE_LIST_MAX_AGE):
+        df = data_store.read_partition("5dtu-swbk")
+        if df is not None and not df.empty:
+            return df
+
+    results = client.get("5dtu-swbk", select=select, limit=500000)
+    df = pd.DataFrame.from_records(results)
+    if not df.empty:
+        data_store.write_partition("5dtu-swbk", df, version=version)
+    return df
+
+def sync_committee_transactions(client, dataset_id, committee_name, version=None,
+                                select="*", on_progress=None):
+    """One committee's rows of a transaction dataset.
+    Served from the on-disk cache when it was synced at version; a stale copy is
+    refreshed incrementally by fetching only rows updated since its :updated_at
+    high-water mark. Rows deleted upstream never appear in that delta, so the merge
+    is checked against the server's row count and the committee is downloaded in
+    full on a mismatch, or once its last full download is older than
+    FULL_SYNC_MAX_AGE. on_progress(rows_loaded) reports rows loaded so far."""
+    _, date_columns, amount_columns = TRANSACTION_DATASETS[dataset_id]
+    # Escape single quotes in committee name for SoQL query
+    escaped_name = committee_name.replace("'", "''")
+    query = f"committee_nm='{escaped_name}'"
+
+    df_cached = data_store.read_committee_partition(dataset_id, committee_name, max_age=None)
+    if df_cached is not None:
+        if on_progress:
+            on_progress(len(df_cached))
+        if data_store.is_committee_partition_fresh(dataset_id, committee_name, version):
+            return df_cached
+
+    # Only fetch rows changed since the cached copy was last synced
+    where = query
+    incremental = (df_cached is not None and ':updated_at' in df_cached.columns
+                   and df_cached[':updated_at'].notna().any()
+                   and not data_store.is_committee_full_sync_due(dataset_id, committee_name))
+    if incremental:
+        high_water = df_cached[':updated_at'].max().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+        where = f"{query} AND :updated_at >= '{high_water}'"
+
+    def fetch(where):
+        return fetch_dataset_pages(client, dataset_id,
+                                   where=where,
+                                   select=f"{select}, :id, :updated_at",
+                                   date_columns=date_columns + [':updated_at'],
+                                   amount_columns=amount_columns,
+                                   on_progress=on_progress,
+                                   wire_format=BULK_WIRE_FORMAT)
+
+    df = fetch(where)
+
+    if incremental:
+        df_merged = merge_incremental(df_cached, df)
+        if committee_row_count(client, dataset_id, query) == len(df_merged):
+            if df_merged is df_cached:
+                data_store.touch_committee_partition(dataset_id, committee_name, version=version)
+            else:
+                data_store.write_committee_partition(dataset_id, committee_name, df_merged,
+                                                     version=version, full_sync=False)
+            if on_progress:
+                on_progress(len(df_merged))
+            return df_merged
+        # Rows were deleted upstream: only a full download drops them
+        df = fetch(query)
+
+    data_store.write_committee_partition(dataset_id, committee_name, df, version=version)
+    return df
+
+class SocrataBackend:
+    """Answers the app's data queries from the Socrata API, writing committee
+    downloads through to the on-disk cache."""
+
+    name = "socrata"
+    # Summary mode sends SoQL aggregate queries, which only Socrata can run
+    supports_aggregation = True
+
+    def __init__(self, client):
+        self.client = client
+        # ETag/Last-Modified validators, last seen version and columns per dataset
+        self.validators = {}
+
+    def dataset_versions(self):
+        """Get the rowsUpdatedAt version of each dataset from the views API.
+        Uses conditional requests so an unchanged dataset only costs a 304 response.
+        Unknown versions are None."""
+        versions = {}
+        for dataset_id in DATASET_IDS:
+            entry = self.validators.get(dataset_id, {})
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            try:
+                response = self.client.get_metadata(dataset_id, headers=headers)
+                if response.status_code == 200:
+                    data = response.json()
+                    # Try to find updatedAt or similar field
+                    version = None
+                    for key in ['rowsUpdatedAt', 'updatedAt', 'viewLastModified']:
+                        if key in data:
+                            version = data[key]
+                            break
+                    entry = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'version': version,
+                        'columns': [c['fieldName'] for c in data.get('columns', []) if 'fieldName' in c]
+                    }
+                    self.validators[dataset_id] = entry
+            except Exception:
+                # If metadata fetch fails, keep the last known version
+                pass
+            versions[dataset_id] = entry.get('version')
+        return versions
+
+    def dataset_columns(self, dataset_id):
+        """Column names of a dataset, or None until its metadata has been fetched."""
+        return self.validators.get(dataset_id, {}).get('columns')
+
+    def projection(self, dataset_id, columns):
+        """$select for the declared columns that exist in the dataset."""
+        return projection_select(columns, self.dataset_columns(dataset_id))
+
+    def committee_list(self, version=None):
+        """Every committee, with the columns the search page filters on."""
+        return sync_committee_list(self.client, version,
+                                   select=self.projection("5dtu-swbk", COMMITTEE_COLUMNS))
+
+    def activity_dates(self, dataset_id):
+        """First and latest transaction date per committee (committee_nm,
+        first_date, latest_date columns)."""
+        return fetch_dataset_pages(
+            self.client,
+            dataset_id,
+            select="committee_nm, min(date) AS first_date, max(date) AS latest_date",
+            group="committee_nm",
+            order="committee_nm",
+            date_columns=['first_date', 'latest_date']
+        )
+
+    def committee_transactions(self, dataset_id, committee_name, version=None, on_progress=None):
+        """One committee's rows of a transaction dataset (see sync_committee_transactions)."""
+        projection, _, _ = TRANSACTION_DATASETS[dataset_id]
+        return sync_committee_transactions(self.client, dataset_id, committee_name, version,
+                                           select=self.projection(dataset_id, projection),
+                                           on_progress=on_progress)
+
+    def export_transactions(self, dataset_id, committee_name):
+        """Every column of one committee's rows of a transaction dataset."""
+        escaped_name = committee_name.replace("'", "''")
+        _, date_columns, amount_columns = TRANSACTION_DATASETS[dataset_id]
+        return fetch_dataset_pages(self.client, dataset_id, where=f"committee_nm='{escaped_name}'",
+                                   date_columns=date_columns, amount_columns=amount_columns,
+                                   wire_format=BULK_WIRE_FORMAT)
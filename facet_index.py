@@ -0,0 +1,83 @@
+"""Faceted filtering of the committee list for the search sidebar.
+
+FacetIndex encodes each filterable column once per committee dataset version:
+every row gets the integer id of its value and every value keeps the ids of its
+rows. Narrowing the results and listing each dropdown's remaining options are
+then boolean mask intersections and counts over those ids, instead of copying,
+re-filtering and re-sorting the committee frame once per dropdown.
+"""
+import numpy as np
+import pandas as pd
+
+from name_index import NameIndex
+
+class Facet:
+    """One filterable column: its distinct values in display order, each row's
+    value id (-1 when missing) and the rows of each value. Searchable facets also
+    keep a NameIndex over their values."""
+
+    def __init__(self, series, reverse=False, searchable=False):
+        self.values = sorted(series.dropna().unique(), reverse=reverse)
+        self.labels = pd.Series([str(v) for v in self.values], dtype=object)
+        self.codes = pd.Index(self.values).get_indexer(series).astype(np.int32)
+        # Postings: rows of value i are order[starts[i]:starts[i + 1]]
+        self.order = np.argsort(self.codes, kind='stable')
+        self.starts = np.searchsorted(self.codes[self.order], np.arange(len(self.values) + 1))
+        self.label_ids = {}
+        for i, label in enumerate(self.labels):
+            self.label_ids.setdefault(label, []).append(i)
+        self.name_index = NameIndex(self.labels) if searchable else None
+
+    def rows(self, ids):
+        """Mask of the rows whose value id is in ids."""
+        mask = np.zeros(len(self.codes), dtype=bool)
+        for i in ids:
+            mask[self.order[self.starts[i]:self.starts[i + 1]]] = True
+        return mask
+
+    def present(self, mask):
+        """Number of rows under mask per value id."""
+        codes = self.codes[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self.values))
+
+class FacetIndex:
+    """Facets of a frame keyed by filter name; masks are aligned with its rows."""
+
+    def __init__(self, df, columns, reverse=(), searchable=()):
+        self.size = len(df)
+        self.facets = {name: Facet(df[col], reverse=name in reverse, searchable=name in searchable)
+                       for name, col in columns.items()}
+
+    def all_rows(self):
+        return np.ones(self.size, dtype=bool)
+
+    def isin(self, name, labels):
+        """Rows whose value of facet name, as a string, is one of labels."""
+        facet = self.facets[name]
+        return facet.rows([i for label in labels for i in facet.label_ids.get(label, [])])
+
+    def contains(self, name, text):
+        """Rows whose value of facet name contains text, ignoring case."""
+        facet = self.facets[name]
+        if facet.name_index is not None:
+            return facet.rows(facet.name_index.matches(text))
+        matches = facet.labels.str.contains(text, case=False, regex=False)
+        return facet.rows(np.flatnonzero(matches.to_numpy(dtype=bool)))
+
+    def search(self, name, query, limit=None):
+        """Values of searchable facet name containing query, best match first
+        (see NameIndex.search)."""
+        return self.facets[name].name_index.search(query, limit)
+
+    def options(self, name, mask):
+        """Non-blank values of facet name among the rows under mask, in display order."""
+        facet = self.facets.get(name)
+        if facet is None:
+            return []
+        present = facet.present(mask) > 0
+        return [label for label, keep in zip(facet.labels, present) if keep and label.strip() != '']
+
+    def count(self, name, mask):
+        """Distinct values of facet name among the rows under mask."""
+        facet = self.facets.get(name)
+        return int((facet.present(mask) > 0).sum()) if facet is not None else 0
@@ -0,0 +1,274 @@
+"""Local SQLite copy of the three Iowa campaign finance datasets.
+
+    python local_engine.py
+    python local_engine.py --committees C.csv.gz --contributions T.csv.gz \
+        --expenditures E.csv.gz [--metadata-dir DIR]
+
+downloads the committee list, contributions and expenditures into
+LOCAL_DB_PATH, with indexes on committee name and date, or imports them from
+the portal's CSV exports for air-gapped deployments and reproducible fixtures.
+Run the app with DATA_BACKEND=local to answer committee and transaction
+queries from it instead of Socrata; rerun the command to pick up new filings. The database is
+built next to the old one and swapped in when complete, so a running app
+keeps serving the previous copy while it loads.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+import data_store
+import data_sync
+from processing import process_contributions, process_expenditures
+from socrata_client import SocrataClient
+
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", os.path.join(data_store.DATA_CACHE_DIR, "iowa_campaign_finance.sqlite"))
+
+# Dataset id -> table name and the columns it keeps
+TABLES = {
+    "5dtu-swbk": ("committees", data_sync.COMMITTEE_COLUMNS),
+    "smfg-ds7h": ("contributions", data_sync.CONTRIBUTION_COLUMNS),
+    "3adi-mht4": ("expenditures", data_sync.EXPENDITURE_COLUMNS)
+}
+CSV_CHUNK_SIZE = 200000  # Rows per chunk when importing CSV exports
+
+def create_table(conn, table, columns, amount_columns):
+    """Create an empty table and return the INSERT statement for its rows."""
+    column_defs = ", ".join(
+        f'"{col}" REAL' if col in amount_columns else f'"{col}" TEXT' for col in columns
+    )
+    conn.execute(f'CREATE TABLE {table} ({column_defs})')
+    return f'INSERT INTO {table} VALUES ({", ".join("?" for _ in columns)})'
+
+def insert_rows(conn, insert, df, columns):
+    """Insert a chunk of rows, filling columns it doesn't have with NULL."""
+    df = df.reindex(columns=columns).astype(object)
+    conn.executemany(insert, df.where(df.notna(), None).itertuples(index=False, name=None))
+
+def format_dates(df, date_columns):
+    """Store dates in Socrata's ISO format, which compares correctly as text."""
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = df[col].dt.strftime('%Y-%m-%dT%H:%M:%S.000')
+    return df
+
+def load_table(conn, client, table, dataset_id, columns, date_columns, amount_columns):
+    """Stream one dataset from Socrata into a new table, a page at a time."""
+    insert = create_table(conn, table, columns, amount_columns)
+    rows_loaded = 0
+    for page in data_sync.iter_dataset_pages(client, dataset_id,
+                                             select=", ".join(columns),
+                                             date_columns=date_columns,
+                                             amount_columns=amount_columns,
+                                             wire_format=data_sync.BULK_WIRE_FORMAT):
+        # JSON pages leave out null fields, so they don't all have every column
+        insert_rows(conn, insert, format_dates(page, date_columns), columns)
+        rows_loaded += len(page)
+        print(f"  {table}: {rows_loaded:,} rows", end="\r", flush=True)
+    print(f"  {table}: {rows_loaded:,} rows")
+
+def finish_database(conn, versions):
+    """Index the loaded tables and record the dataset versions they hold."""
+    # Committee lookups and date range scans are answered from these indexes
+    for table in ["contributions", "expenditures"]:
+        conn.execute(f'CREATE INDEX {table}_committee_date ON {table} (committee_nm, date)')
+        conn.execute(f'CREATE INDEX {table}_date_committee ON {table} (date, committee_nm)')
+    committee_columns = [row[1] for row in conn.execute('PRAGMA table_info(committees)')]
+    for col in ['committee_name', 'committee_nm', 'committee']:
+        if col in committee_columns:
+            conn.execute(f'CREATE INDEX committees_name ON committees ("{col}")')
+            break
+
+    conn.execute('CREATE TABLE dataset_versions (dataset_id TEXT PRIMARY KEY, version, loaded_at REAL)')
+    conn.executemany('INSERT INTO dataset_versions VALUES (?, ?, ?)',
+                     [(dataset_id, version, time.time()) for dataset_id, version in versions.items()])
+    conn.execute('ANALYZE')
+    conn.commit()
+
+def write_database(db_path, load):
+    """Build a database with load(conn) next to db_path and swap it in when complete."""
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    try:
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            load(conn)
+        os.replace(tmp_path, db_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def build_database(client, db_path=LOCAL_DB_PATH):
+    """Download all three datasets into a fresh SQLite database at db_path."""
+    backend = data_sync.SocrataBackend(client)
+    versions = backend.dataset_versions()
+
+    def load(conn):
+        for dataset_id, (table, declared) in TABLES.items():
+            available = backend.dataset_columns(dataset_id)
+            if not available:
+                raise RuntimeError(f"Could not read the schema of dataset {dataset_id}")
+            columns = [col for col in declared if col in available]
+            _, date_columns, amount_columns = data_sync.TRANSACTION_DATASETS.get(dataset_id, ([], [], []))
+            load_table(conn, client, table, dataset_id, columns, date_columns, amount_columns)
+        finish_database(conn, versions)
+
+    write_database(db_path, load)
+
+def snapshot_metadata(path):
+    """Version and display name -> field name mapping from a saved views API
+    document (https://data.iowa.gov/api/views/<id>.json), or (None, {})."""
+    if not path:
+        return None, {}
+    with open(path) as f:
+        data = json.load(f)
+    field_names = {c['name']: c['fieldName'] for c in data.get('columns', [])
+                   if 'name' in c and 'fieldName' in c}
+    return data.get('rowsUpdatedAt'), field_names
+
+def import_csv(conn, table, dataset_id, path, field_names, chunk_size=CSV_CHUNK_SIZE):
+    """Stream one CSV or CSV.gz export into a new table in fixed-size chunks.
+    Headers may be API field names or, with field_names, the portal's display
+    names. Transaction rows get the same normalisation the app applies."""
+    declared = TABLES[dataset_id][1]
+    header = pd.read_csv(path, nrows=0).columns
+    renames = {name: field_names.get(name, name) for name in header}
+    columns = [col for col in declared if col in renames.values()]
+    if not columns:
+        raise ValueError(f"{path} has none of the expected columns for dataset {dataset_id}")
+    usecols = [name for name in header if renames[name] in columns]
+
+    date_columns, amount_columns = [], []
+    if dataset_id in data_sync.TRANSACTION_DATASETS:
+        _, date_columns, amount_columns = data_sync.TRANSACTION_DATASETS[dataset_id]
+    process = {"smfg-ds7h": process_contributions, "3adi-mht4": process_expenditures}.get(dataset_id)
+    derived = {"smfg-ds7h": ['contributor_final'], "3adi-mht4": ['recipient_final']}.get(dataset_id, [])
+    table_columns = columns + derived
+    insert = create_table(conn, table, table_columns, amount_columns)
+
+    rows_loaded = 0
+    # Everything is read as text so every chunk has the same dtypes; dates and
+    # amounts are then converted once by the processing functions
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunk_size):
+        chunk = chunk.rename(columns=renames)
+        if process:
+            for col in amount_columns:
+                if col in chunk.columns:
+                    chunk[col] = chunk[col].str.replace(r'[$,]', '', regex=True)
+            chunk = format_dates(process(chunk), date_columns)
+        insert_rows(conn, insert, chunk, table_columns)
+        rows_loaded += len(chunk)
+        print(f"  {table}: {rows_loaded:,} rows", end="\r", flush=True)
+    print(f"  {table}: {rows_loaded:,} rows")
+
+def build_database_from_csv(snapshots, db_path=LOCAL_DB_PATH):
+    """Build the database from downloaded CSV exports instead of the API.
+    snapshots maps each dataset id to (csv_path, metadata_path or None).
+    The version of a dataset is its rowsUpdatedAt when metadata is given,
+    otherwise the CSV file's modification time."""
+    versions = {}
+
+    def load(conn):
+        for dataset_id, (table, _) in TABLES.items():
+            csv_path, metadata_path = snapshots[dataset_id]
+            version, field_names = snapshot_metadata(metadata_path)
+            versions[dataset_id] = version if version is not None else int(os.path.getmtime(csv_path))
+            import_csv(conn, table, dataset_id, csv_path, field_names)
+        finish_database(conn, versions)
+
+    write_database(db_path, load)
+
+class LocalBackend:
+    """Answers the app's data queries from the local SQLite database.
+    Same interface as data_sync.SocrataBackend."""
+
+    name = "local"
+    # Summary mode's SoQL aggregates need Socrata; locally the rows are cheap to read
+    supports_aggregation = False
+
+    def __init__(self, db_path=LOCAL_DB_PATH):
+        self.db_path = db_path
+
+    def query(self, sql, params=()):
+        """Run a read-only query and return the result as a DataFrame."""
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(
+                f"Local database {self.db_path} not found. Build it with: python local_engine.py"
+            )
+        # A connection per query, so worker threads never share one
+        with closing(sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def dataset_versions(self):
+        """Versions of the datasets the database was built from."""
+        try:
+            df = self.query('SELECT dataset_id, version FROM dataset_versions')
+            versions = dict(zip(df['dataset_id'], df['version']))
+        except Exception:
+            versions = {}
+        return {dataset_id: versions.get(dataset_id) for dataset_id in data_sync.DATASET_IDS}
+
+    def dataset_columns(self, dataset_id):
+        """Column names of a dataset's table, or None if it isn't loaded."""
+        try:
+            return self.query(f'PRAGMA table_info({TABLES[dataset_id][0]})')['name'].tolist() or None
+        except Exception:
+            return None
+
+    def committee_list(self, version=None):
+        """Every committee, with the columns the search page filters on."""
+        return self.query('SELECT * FROM committees')
+
+    def activity_dates(self, dataset_id):
+        """First and latest transaction date per committee (committee_nm,
+        first_date, latest_date columns)."""
+        table = TABLES[dataset_id][0]
+        df = self.query(f'SELECT committee_nm, min(date) AS first_date, max(date) AS latest_date '
+                        f'FROM {table} GROUP BY committee_nm')
+        return data_sync.type_page(df, ['first_date', 'latest_date'], [])
+
+    def committee_transactions(self, dataset_id, committee_name, version=None, on_progress=None):
+        """One committee's rows of a transaction dataset."""
+        _, date_columns, amount_columns = data_sync.TRANSACTION_DATASETS[dataset_id]
+        df = self.query(f'SELECT * FROM {TABLES[dataset_id][0]} WHERE committee_nm = ?', (committee_name,))
+        if on_progress:
+            on_progress(len(df))
+        return data_sync.type_page(df, date_columns, amount_columns)
+
+    def export_transactions(self, dataset_id, committee_name):
+        """One committee's rows of a transaction dataset, as stored locally."""
+        return self.committee_transactions(dataset_id, committee_name)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the local SQLite store from the Socrata API or from CSV exports."
+    )
+    parser.add_argument("--committees", help="CSV or CSV.gz export of 5dtu-swbk")
+    parser.add_argument("--contributions", help="CSV or CSV.gz export of smfg-ds7h")
+    parser.add_argument("--expenditures", help="CSV or CSV.gz export of 3adi-mht4")
+    parser.add_argument("--metadata-dir",
+                        help="directory of saved views API documents named <dataset id>.json, "
+                             "used for versions and display-name headers")
+    args = parser.parse_args()
+
+    csv_paths = {"5dtu-swbk": args.committees, "smfg-ds7h": args.contributions, "3adi-mht4": args.expenditures}
+    print(f"Building {LOCAL_DB_PATH}")
+    if any(csv_paths.values()):
+        if not all(csv_paths.values()):
+            parser.error("--committees, --contributions and --expenditures must be given together")
+        snapshots = {}
+        for dataset_id, csv_path in csv_paths.items():
+            metadata_path = None
+            if args.metadata_dir and os.path.exists(os.path.join(args.metadata_dir, f"{dataset_id}.json")):
+                metadata_path = os.path.join(args.metadata_dir, f"{dataset_id}.json")
+            snapshots[dataset_id] = (csv_path, metadata_path)
+        build_database_from_csv(snapshots)
+    else:
+        build_database(SocrataClient(app_token=os.getenv("SOCRATA_TOKEN")))
+    print("Done")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Case-insensitive substring search over a list of names.
+
+NameIndex keeps, for every three-character sequence (trigram), the ids of the
+names containing it. A query's candidates are the intersection of its trigrams'
+postings, checked against the names, so a lookup touches only the names that
+share the query's rarest trigram instead of scanning every name. It works over
+any list of names: committee and candidate names, or the distinct contributor
+and payee names (the categories of contributor_final / recipient_final).
+"""
+from collections import defaultdict
+
+import numpy as np
+
+def trigrams(text):
+    """Distinct three-character sequences of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class NameIndex:
+    """Trigram postings over names, matched ignoring case."""
+
+    def __init__(self, names):
+        self.names = [str(name) for name in names]
+        self.folded = [name.lower() for name in self.names]
+        postings = defaultdict(list)
+        for i, name in enumerate(self.folded):
+            for gram in trigrams(name):
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def matches(self, query):
+        """Ids of the names containing query, ignoring case, in index order."""
+        query = query.lower()
+        grams = trigrams(query)
+        if not grams:
+            # Too short for trigrams: these match so many names a scan is as fast
+            return np.array([i for i, name in enumerate(self.folded) if query in name], dtype=np.int32)
+        lists = sorted((self.postings.get(gram) for gram in grams), key=lambda ids: 0 if ids is None else len(ids))
+        if lists[0] is None:
+            return np.array([], dtype=np.int32)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not len(candidates):
+                break
+        # Sharing every trigram doesn't mean they are contiguous
+        return np.array([i for i in candidates if query in self.folded[i]], dtype=np.int32)
+
+    def search(self, query, limit=None):
+        """Names containing query, best first: exact matches, then names starting
+        with it, then names with a word starting with it, then the rest; ties go
+        to the earlier match, then the shorter name."""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        def rank(i):
+            name = self.folded[i]
+            if name == query:
+                kind = 0
+            elif name.startswith(query):
+                kind = 1
+            elif f" {query}" in f" {name}":
+                kind = 2
+            else:
+                kind = 3
+            return kind, name.find(query), len(name), name
+
+        ranked = sorted(self.matches(query), key=rank)
+        return [self.names[i] for i in ranked[:limit]]
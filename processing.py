@@ -0,0 +1,143 @@
+"""Normalisation of raw contribution and expenditure rows.
+
+Shared by the app and local_engine's snapshot import so both see the same
+typed columns and derived name columns. compact_transactions shrinks the
+frames the app keeps cached; only the app's committee loader applies it.
+"""
+import pandas as pd
+
+# Text columns with at most this many distinct values per row become categoricals
+CATEGORY_MAX_RATIO = 0.5
+# Unique-per-row text columns, stored as Arrow strings instead of Python objects
+ARROW_STRING_COLUMNS = [':id']
+
+# Column names each dataset has gone by, in order of preference
+CONTRIBUTION_DATE_COLUMNS = ['date', 'contribution_date', 'transaction_date']
+EXPENDITURE_DATE_COLUMNS = ['date', 'expenditure_date', 'transaction_date']
+CONTRIBUTION_AMOUNT_COLUMNS = ['amount', 'contribution_amount', 'transaction_amount']
+EXPENDITURE_AMOUNT_COLUMNS = ['amount', 'expenditure_amount', 'transaction_amount']
+TRANSACTION_TYPE_COLUMNS = ['transaction_type', 'trans_type', 'type', 'contribution_type', 'transaction_cd', 'trans_cd']
+
+def find_column(df, candidates):
+    """First of candidates that df has, or None."""
+    for col in candidates:
+        if col in df.columns:
+            return col
+    return None
+
+def contributor_names(df):
+    """Contributor name per row: organization_nm when it isn't blank, otherwise
+    "first_nm last_nm" trimmed. Missing names render as str() does ("nan",
+    "None"), matching the row-by-row f-string this replaced."""
+    org = df['organization_nm']
+    has_org = org.notna() & (org.astype(str).str.strip() != '')
+    person = (df['first_nm'].astype(str) + ' ' + df['last_nm'].astype(str)).str.strip()
+    return org.astype(object).where(has_org, person)
+
+def process_contributions(df):
+    """Process contributions dataframe."""
+    if df.empty:
+        return df
+    
+    df = df.copy()
+    
+    # Create contributor_final column
+    if 'organization_nm' in df.columns and 'first_nm' in df.columns and 'last_nm' in df.columns:
+        df['contributor_final'] = contributor_names(df)
+    
+    # Convert date column to datetime
+    for col in CONTRIBUTION_DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    # Convert amount to float
+    for col in CONTRIBUTION_AMOUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    return df
+
+def process_expenditures(df):
+    """Process expenditures dataframe."""
+    if df.empty:
+        return df
+    
+    df = df.copy()
+    
+    # Convert date column to datetime
+    for col in EXPENDITURE_DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    # Convert amount to float
+    for col in EXPENDITURE_AMOUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Resolve recipient names once per load so charts just group on them
+    df['recipient_final'] = recipient_names(df)
+    
+    return df
+
+def recipient_names(df):
+    """Recipient name per expenditure: organization_nm when it isn't blank,
+    otherwise "first_nm last_nm (state)", falling back to the first recipient,
+    payee or vendor column, or 'Unknown'. Missing names render as str() does,
+    matching the row-by-row version this replaced."""
+    def text(col):
+        return df[col].astype(str) if col in df.columns else pd.Series('', index=df.index)
+    
+    if 'organization_nm' in df.columns or ('first_nm' in df.columns and 'last_nm' in df.columns):
+        person = (text('first_nm') + ' ' + text('last_nm')).str.strip()
+        if 'state' in df.columns:
+            has_state = df['state'].notna() & (df['state'].astype(str).str.strip() != '')
+            person = person + (' (' + df['state'].astype(str) + ')').where(has_state, '')
+        if 'organization_nm' not in df.columns:
+            return person
+        org = df['organization_nm']
+        has_org = org.notna() & (org.astype(str).str.strip() != '')
+        return org.astype(object).where(has_org, person)
+    
+    # Fallback to finding recipient column
+    for col in ['recipient', 'recipient_nm', 'payee', 'payee_nm', 'vendor', 'vendor_nm', 'expenditure_recipient']:
+        if col in df.columns:
+            return df[col]
+    return pd.Series('Unknown', index=df.index)
+
+def add_recipient_final(df):
+    """Add a recipient_final column naming each expenditure's recipient
+    (see recipient_names)."""
+    df = df.copy()
+    df['recipient_final'] = recipient_names(df)
+    return df
+
+def compact_transactions(df):
+    """Shrink a transaction frame for caching: repetitive text columns (committee,
+    state, transaction type, city, names) become categoricals, row ids become
+    Arrow strings and integer columns are downcast. Amounts stay float64, since
+    float32 can't hold cents exactly and totals would drift."""
+    if df.empty:
+        return df
+    # Shallow copy: columns are replaced, never modified in place
+    df = df.copy(deep=False)
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            if col in ARROW_STRING_COLUMNS:
+                df[col] = series.astype('string[pyarrow]')
+            elif series.nunique() <= len(series) * CATEGORY_MAX_RATIO:
+                df[col] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+    return df
+
+def sort_by_date(df, date_col):
+    """df ordered by date_col (undated rows last) with a fresh index, so year and
+    date range filters can slice it by position."""
+    if df.empty or not date_col:
+        return df
+    return df.sort_values(date_col, kind='stable', na_position='last', ignore_index=True)
+
+def frame_memory(df):
+    """Memory a frame holds, in bytes, including the strings it references."""
+    return int(df.memory_usage(deep=True).sum())
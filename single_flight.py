@@ -0,0 +1,35 @@
+"""In-flight request coalescing shared by all sessions of the app.
+
+st.cache_data only dedupes finished calls: when several sessions miss the cache
+for the same committee at once, each one downloads it. SingleFlight lets the
+first caller for a key submit the work while concurrent callers for the same key
+get that call's Future and wait for its result (or its exception) on their own
+thread, instead of repeating the request or holding a pool worker just to wait.
+"""
+import threading
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its Future."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def submit(self, key, executor, fn):
+        """Future of fn() run on executor, or of the call already in flight for key.
+        Only the first caller for a key takes an executor worker."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = executor.submit(fn)
+        if leader:
+            # Outside the lock: the callback runs right away if fn already finished
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        # Later callers start a fresh call; the cache layers above serve them
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,91 @@
+"""Pooled HTTP client for the data.iowa.gov Socrata API.
+
+One SocrataClient is shared by every session of the app. It keeps a keep-alive
+connection pool, asks for gzip responses, and retries failed requests with
+jittered exponential backoff, honouring Retry-After on 429/503 responses.
+Pool size and retry behaviour can be tuned with environment variables.
+"""
+import os
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SOCRATA_DOMAIN = "data.iowa.gov"
+POOL_SIZE = int(os.getenv("SOCRATA_POOL_SIZE", "32"))  # Connections kept open per host
+MAX_RETRIES = int(os.getenv("SOCRATA_MAX_RETRIES", "4"))
+BACKOFF_FACTOR = float(os.getenv("SOCRATA_BACKOFF_FACTOR", "1.0"))  # Seconds, doubled per retry
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 120  # seconds - large committee pages can be slow to generate
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class JitteredRetry(Retry):
+    """Retry policy whose exponential backoff is randomised so that concurrent
+    sessions don't retry in lockstep."""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff * random.uniform(0.5, 1.5) if backoff else 0
+
+class SocrataClient:
+    """Minimal SODA client on a pooled requests session."""
+
+    def __init__(self, domain=SOCRATA_DOMAIN, app_token=None, pool_size=POOL_SIZE,
+                 max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.domain = domain
+        self.timeout = timeout
+        retry = JitteredRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip'
+        })
+        if app_token:
+            self.session.headers['X-App-Token'] = app_token
+
+    def get(self, dataset_id, **soql):
+        """Run a SoQL query against a dataset and return the rows as a list of dicts.
+        Keyword arguments are SoQL parameters without the leading $ (select, where,
+        group, order, limit, offset); None values are left out."""
+        params = {f"${key}": value for key, value in soql.items() if value is not None}
+        response = self.session.get(
+            f"https://{self.domain}/resource/{dataset_id}.json",
+            params=params,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_csv(self, dataset_id, **soql):
+        """Run a SoQL query and return the raw CSV body (header row included).
+        Takes the same keyword arguments as get()."""
+        params = {f"${key}": value for key, value in soql.items() if value is not None}
+        response = self.session.get(
+            f"https://{self.domain}/resource/{dataset_id}.csv",
+            params=params,
+            headers={'Accept': 'text/csv'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.content
+
+    def get_metadata(self, dataset_id, headers=None, timeout=5):
+        """Request a dataset's views API metadata.
+        Returns the response itself so callers can handle conditional (304) replies."""
+        return self.session.get(
+            f"https://{self.domain}/api/views/{dataset_id}.json",
+            headers=headers,
+            timeout=timeout
+        )
@@ -0,0 +1,60 @@
+"""Pre-populate the on-disk data cache before visitors arrive.
+
+    python warm_cache.py [--top N] [--concurrency K]
+
+Syncs the committee list, the committee activity table behind the default
+search view and the contributions and expenditures of the N most viewed
+committees into DATA_CACHE_DIR, so a freshly deployed app serves them from disk
+instead of Socrata. Run it before starting the server or from cron. The app
+itself only warms its in-memory caches once the first session runs app.py
+(see start_cache_warmer in app.py), so that visitor waits without this.
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import data_store
+import data_sync
+from socrata_client import SocrataClient
+
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1") != "0"
+# Most viewed committees to prefetch
+WARMUP_TOP_COMMITTEES = int(os.getenv("WARMUP_TOP_COMMITTEES", "10"))
+# Requests the warmer keeps in flight, kept low so it doesn't trip Socrata throttling
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "2"))
+
+def warm_disk_cache(client, top_n=WARMUP_TOP_COMMITTEES, concurrency=WARMUP_CONCURRENCY):
+    """Sync the committee list, the committee activity table and the top_n most
+    viewed committees to disk. Returns the names of the committees that were synced."""
+    backend = data_sync.SocrataBackend(client)
+    versions = backend.dataset_versions()
+    backend.committee_list(versions["5dtu-swbk"])
+    data_sync.sync_committee_activity(backend, versions["smfg-ds7h"], versions["3adi-mht4"])
+
+    committees = data_store.most_viewed_committees(top_n)
+    jobs = [(dataset_id, committee_name)
+            for committee_name in committees
+            for dataset_id in data_sync.TRANSACTION_DATASETS]
+
+    def sync(job):
+        dataset_id, committee_name = job
+        backend.committee_transactions(dataset_id, committee_name, versions[dataset_id])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(sync, jobs))
+    return committees
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-populate the Iowa campaign finance data cache.")
+    parser.add_argument("--top", type=int, default=WARMUP_TOP_COMMITTEES,
+                        help="number of most viewed committees to prefetch")
+    parser.add_argument("--concurrency", type=int, default=WARMUP_CONCURRENCY,
+                        help="maximum Socrata requests in flight")
+    args = parser.parse_args()
+
+    client = SocrataClient(app_token=os.getenv("SOCRATA_TOKEN"))
+    committees = warm_disk_cache(client, top_n=args.top, concurrency=args.concurrency)
+    print(f"Warmed committee list, activity table and {len(committees)} committees in {data_store.DATA_CACHE_DIR}")
+
+if __name__ == "__main__":
+    main()